@@ -1,20 +1,78 @@
-from collections.abc import AsyncGenerator
+import asyncio
+
+import asyncpg
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from contextlib import asynccontextmanager
+from sqlalchemy import text, Select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.dml import UpdateBase
 from app.config.setting import setting
 
 
+def is_read_only(clause) -> bool:
+    '''
+    @ replica 에서 실행해도 되는 쿼리인지 확인
+    - SELECT 중 행 잠금 (FOR UPDATE) / 데이터 변경 CTE (INSERT ... RETURNING 등) 가 없고 use_primary 옵션이 없는 경우만 읽기 전용
+    '''
+    if not isinstance(clause, Select) or clause._for_update_arg is not None:
+        return False
+    if clause.get_execution_options().get('use_primary'):
+        return False
+    return not any(isinstance(element, UpdateBase) for element in visitors.iterate(clause))
+
+
+class RoutingSession(Session):
+    '''
+    @ 읽기 전용 쿼리는 replica, 나머지는 primary 로 보내는 세션
+    - 세션에서 한 번이라도 primary 를 사용하면 (쓰기 / 행 잠금 등) 이후 모든 쿼리를 primary 에서 실행 (read-your-writes)
+    - replica_bind 가 없는 경우 모든 쿼리를 primary 에서 실행
+
+    :param replica_bind: replica engine
+    '''
+
+    def __init__(self, replica_bind=None, **kw):
+        super().__init__(**kw)
+        self.replica_bind = replica_bind
+        self.use_primary = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.replica_bind is not None and not self.use_primary and is_read_only(clause):
+            return self.replica_bind
+
+        self.use_primary = True
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
 class Database:
     def __init__(self):
-        self.async_engine = create_async_engine(
-            setting.get_db_url
-        )
+        self.async_engine = self._create_engine(setting.get_db_url)
+        self.replica_engine = None if setting.get_replica_db_url is None \
+            else self._create_engine(setting.get_replica_db_url)
 
         self.session_factory = async_sessionmaker(
             self.async_engine,
+            sync_session_class=RoutingSession,
+            replica_bind=None if self.replica_engine is None else self.replica_engine.sync_engine,
             expire_on_commit=False
         )
 
+    @staticmethod
+    def _create_engine(url: str):
+        return create_async_engine(
+            url,
+            pool_size=setting.DB_POOL_SIZE,
+            max_overflow=setting.DB_MAX_OVERFLOW,
+            pool_recycle=setting.DB_POOL_RECYCLE,
+            pool_pre_ping=setting.DB_POOL_PRE_PING,
+            connect_args={
+                # asyncpg 자체 statement 캐시 + SQLAlchemy asyncpg 어댑터의 prepared statement 캐시
+                'statement_cache_size': setting.DB_STATEMENT_CACHE_SIZE,
+                'prepared_statement_cache_size': setting.DB_STATEMENT_CACHE_SIZE
+            }
+        )
+
     @asynccontextmanager
     async def session(self) -> AsyncGenerator:
         session = self.session_factory()
@@ -26,5 +84,110 @@ class Database:
         finally:
             await session.close()
 
+    async def get_db(self) -> AsyncGenerator[AsyncSession, None]:
+        '''
+        @ 요청 단위 세션 (FastAPI Depends 로 주입하여 service -> repository 로 전달)
+        - 요청 시작 시 커넥션을 한 번만 체크아웃하고 요청 내 모든 repository 호출이 같은 커넥션을 사용
+        - commit 이후에도 커넥션을 풀에 반환하지 않고 요청이 끝날 때 반환
+        - replica 가 있는 경우 커넥션을 미리 체크아웃하지 않음
+          읽기 전용 쿼리는 replica 커넥션, 그 외 쿼리는 처음 실행될 때 primary 커넥션을 체크아웃 (트랜잭션이 끝날 때 풀에 반환)
+          -> 조회만 하는 요청은 primary 커넥션 풀을 사용하지 않음
+        '''
+        if self.replica_engine is not None:
+            async with self.session_factory() as session:
+                yield session
+        else:
+            async with self.async_engine.connect() as connection:
+                async with self.session_factory(bind=connection) as session:
+                    yield session
+
+    async def gather(self, db: AsyncSession, *calls: Callable[[AsyncSession], Awaitable]) -> list:
+        '''
+        @ 서로 의존하지 않는 조회를 동시에 실행하고 결과를 calls 순서대로 return
+        - AsyncSession 은 한 번에 하나의 쿼리만 실행할 수 있으므로 요청 세션 외에 별도 세션을 열어 나누어 실행
+        - 한 요청이 사용하는 커넥션 수는 요청 세션을 포함하여 DB_REQUEST_MAX_CONNECTIONS 개로 제한
+        - 별도 세션은 요청 세션의 commit 되지 않은 변경을 볼 수 없으므로 조회에만 사용
+        - 조회 중 하나가 실패하면 나머지 조회를 취소하고 모두 끝난 뒤 예외를 발생시킴
+
+        :param db: 요청 세션
+        :param calls: 세션을 인자로 받는 조회 함수
+        '''
+        results = [None] * len(calls)
+        pending = iter(enumerate(calls))
+
+        async def run(session: AsyncSession):
+            # 각 세션은 남은 조회를 하나씩 가져가 순서대로 실행
+            for index, call in pending:
+                results[index] = await call(session)
+
+        async def run_with_own_session():
+            async with self.session_factory() as session:
+                await run(session)
+
+        worker_count = max(min(setting.DB_REQUEST_MAX_CONNECTIONS, len(calls)), 1)
+        tasks = [asyncio.ensure_future(run(db))]
+        tasks += [asyncio.ensure_future(run_with_own_session()) for _ in range(worker_count - 1)]
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # 하나라도 실패하면 (또는 요청이 취소되면) 나머지 조회를 취소하고 끝날 때까지 기다린 뒤 예외 전달
+            # -> 요청 세션이 아직 사용 중인 상태로 닫히지 않도록 함
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return results
+
+    async def warmup(self, connection_count: int):
+        '''
+        @ 트래픽을 받기 전에 커넥션 풀에 connection_count 개의 커넥션을 미리 연결 + 검증 (최대 pool_size 개, replica 포함)
+        - 하나라도 연결에 실패하면 예외를 발생시켜 워커가 기동되지 않도록 함
+
+        :param connection_count: 미리 연결할 커넥션 수
+        '''
+
+        async def connect(engine):
+            connection = await engine.connect()
+            try:
+                await connection.execute(text('SELECT 1'))
+            except Exception:
+                await connection.close()
+                raise
+            return connection
+
+        engines = [self.async_engine] if self.replica_engine is None else [self.async_engine, self.replica_engine]
+
+        # 커넥션을 동시에 잡고 있어야 서로 다른 커넥션이 풀에 채워짐
+        results = await asyncio.gather(
+            *(connect(engine) for engine in engines for _ in range(min(connection_count, setting.DB_POOL_SIZE))),
+            return_exceptions=True
+        )
+
+        for result in results:
+            if not isinstance(result, BaseException):
+                await result.close()
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def connect_raw(self) -> asyncpg.Connection:
+        '''
+        @ 커넥션 풀과 별도로 asyncpg 커넥션을 연결 (LISTEN 처럼 커넥션을 계속 점유하는 용도, 사용 후 직접 close)
+        '''
+        return await asyncpg.connect(
+            user=setting.DB_USER,
+            password=setting.DB_PW,
+            host=setting.DB_HOST,
+            port=int(setting.DB_PORT),
+            database=setting.DB_NAME
+        )
+
+    async def close(self):
+        await self.async_engine.dispose()
+        if self.replica_engine is not None:
+            await self.replica_engine.dispose()
+
 
-database = Database()
\ No newline at end of file
+database = Database()
@@ -0,0 +1,135 @@
+import asyncio
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import bindparam, literal, TEXT
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func, select
+
+from app.config.database import database
+from app.config.setting import setting
+
+
+class InvalidationType(str, Enum):
+    # 퀴즈 생성 (전체 퀴즈 수)
+    QUIZ_CREATED = 'quiz_created'
+    # 퀴즈 버전 생성 완료 (버전 별 문제 구성 + 정답표)
+    QUIZ_VERSIONS_READY = 'quiz_versions_ready'
+    # 최종 제출 (아직 저장되지 않은 임시 저장 답안)
+    QUIZ_SUBMITTED = 'quiz_submitted'
+
+
+class InvalidationEvent(BaseModel):
+    # id 가 없는 이벤트는 해당 종류의 캐시 전체를 제거
+    type: InvalidationType
+    quiz_id: Optional[int] = None
+    user_id: Optional[int] = None
+
+
+class InvalidationBus:
+    '''
+    @ Postgres LISTEN / NOTIFY 기반 워커 간 캐시 무효화
+    - publish : 변경과 같은 트랜잭션에서 pg_notify 실행 (commit 된 경우에만 전달, rollback 시 전달되지 않음)
+    - 모든 워커 (발행한 워커 포함) 가 별도 커넥션으로 LISTEN 하여 이벤트 종류 별로 등록된 handler 실행
+    - 연결이 끊긴 동안 놓친 이벤트가 있을 수 있으므로 LISTEN 을 시작할 때마다 모든 캐시를 제거
+
+    :param channel: NOTIFY 채널
+    :param reconnect_interval: 연결 실패 시 재연결 주기 (초)
+    :param ping_interval: 연결 확인 주기 (초)
+    '''
+
+    def __init__(self, channel: str, reconnect_interval: float, ping_interval: float):
+        self.channel = channel
+        self.reconnect_interval = reconnect_interval
+        self.ping_interval = ping_interval
+        self._handlers: Dict[InvalidationType, List[Callable[[InvalidationEvent], None]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, event_type: InvalidationType, handler: Callable[[InvalidationEvent], None]):
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    async def publish(self, db: AsyncSession, events: List[InvalidationEvent]):
+        '''
+        @ 이벤트 발행 (commit 은 호출하는 쪽에서 변경과 함께)
+        - 여러 이벤트를 한 번의 쿼리로 발행 (이벤트 하나가 NOTIFY payload 하나)
+        '''
+        if len(events) == 0:
+            return
+
+        payload = func.unnest(
+            bindparam('payloads', [event.model_dump_json() for event in events], type_=ARRAY(TEXT))
+        ).table_valued('payload').render_derived(with_types=False)
+
+        # NOTIFY 는 replica 에서 실행할 수 없으므로 세션의 첫 쿼리인 경우에도 primary 에서 실행
+        await db.execute(
+            select(func.pg_notify(literal(self.channel), payload.c.payload))
+            .select_from(payload)
+            .execution_options(use_primary=True)
+        )
+
+    def dispatch(self, event: InvalidationEvent):
+        for handler in self._handlers.get(event.type, []):
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"Invalidation handler failed ({event.type.value}): {e}")
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str):
+        try:
+            event = InvalidationEvent.model_validate_json(payload)
+        except ValueError as e:
+            print(f"Invalid invalidation event: {e}")
+            return
+        self.dispatch(event)
+
+    def _reset(self):
+        for event_type in self._handlers:
+            self.dispatch(InvalidationEvent(type=event_type))
+
+    async def run(self):
+        while True:
+            try:
+                connection = await database.connect_raw()
+            except Exception as e:
+                print(f"Invalidation listener connect failed: {e}")
+                await asyncio.sleep(self.reconnect_interval)
+                continue
+
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            try:
+                await connection.add_listener(self.channel, self._on_notify)
+                self._reset()
+
+                # 연결이 끊기면 재연결 (응답 없이 끊긴 경우는 주기적인 SELECT 1 로 확인)
+                while not closed.is_set():
+                    try:
+                        await asyncio.wait_for(closed.wait(), self.ping_interval)
+                    except asyncio.TimeoutError:
+                        await connection.execute('SELECT 1', timeout=self.ping_interval)
+            except Exception as e:
+                print(f"Invalidation listener disconnected: {e}")
+            finally:
+                connection.terminate()
+
+            await asyncio.sleep(self.reconnect_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+invalidation_bus = InvalidationBus(
+    setting.INVALIDATION_CHANNEL, setting.INVALIDATION_RECONNECT_INTERVAL, setting.INVALIDATION_PING_INTERVAL
+)
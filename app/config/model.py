@@ -1,4 +1,8 @@
-from sqlalchemy import BigInteger, ForeignKey, Integer, TEXT, BOOLEAN, String
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import BigInteger, ForeignKey, Integer, SmallInteger, TEXT, BOOLEAN, String, UniqueConstraint, Index, DateTime, Sequence, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, backref, mapped_column, Mapped
 
@@ -7,7 +11,11 @@ Base = declarative_base()
 
 class User(Base):
     __tablename__ = "user"
-    __table_args__ = {'schema': 'pro'}
+    __table_args__ = (
+        # 로그인 / 회원 가입 시 아이디로 조회
+        UniqueConstraint('user_id', name='user_user_id_key'),
+        {'schema': 'pro'}
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     user_id: Mapped[str] = mapped_column(TEXT, nullable=False, doc='라벨러 ID')
@@ -23,15 +31,21 @@ class Quiz(Base):
     q_count: Mapped[int] = mapped_column(Integer, nullable=False, doc='해당 퀴즈의 총 문제 수')
     s_count: Mapped[int] = mapped_column(Integer, nullable=False, doc='문제 출제 수 (관리자가 설정)')
     p_count: Mapped[int] = mapped_column(Integer, nullable=False, doc='한 목록에 보여질 문제 수 (관리자가 설정)')
+    v_count: Mapped[int] = mapped_column(Integer, nullable=False, default=10, doc='랜덤 출제 시 생성할 버전 수 (관리자가 설정)')
     is_random: Mapped[bool] = mapped_column(BOOLEAN, nullable=False, default=False, doc='랜덤 출제 여부')
+    is_ready: Mapped[bool] = mapped_column(BOOLEAN, nullable=False, default=False, doc='퀴즈 버전 생성 완료 여부 (생성 전에는 사용자가 진입할 수 없음)')
 
 
 class Question(Base):
     __tablename__ = "question"
-    __table_args__ = {'schema': 'pro'}
+    __table_args__ = (
+        # 퀴즈 별 문제를 순서대로 조회 (관리자 상세 조회 페이지 단위 조회)
+        Index('question_quiz_id_sequence_idx', 'quiz_id', 'sequence'),
+        {'schema': 'pro'}
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    quiz_id: Mapped[int] = mapped_column(ForeignKey("pro.quiz.id"), nullable=False, index=True)
+    quiz_id: Mapped[int] = mapped_column(ForeignKey("pro.quiz.id"), nullable=False)
     name: Mapped[str] = mapped_column(TEXT, nullable=False, doc='문제 정보 = 문항')
     sequence: Mapped[int] = mapped_column(Integer, nullable=False, doc='순서')
 
@@ -40,10 +54,14 @@ class Question(Base):
 
 class Selection(Base):
     __tablename__ = "selection"
-    __table_args__ = {'schema': 'pro'}
+    __table_args__ = (
+        # 문제 별 보기 / 정답 보기 조회
+        Index('selection_question_id_is_correct_idx', 'question_id', 'is_correct'),
+        {'schema': 'pro'}
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    question_id: Mapped[int] = mapped_column(ForeignKey("pro.question.id"), nullable=False, index=True)
+    question_id: Mapped[int] = mapped_column(ForeignKey("pro.question.id"), nullable=False)
     name: Mapped[str] = mapped_column(TEXT, nullable=False, doc='보기 정보')
     sequence: Mapped[int] = mapped_column(Integer, nullable=False, doc='순서')
     is_correct: Mapped[bool] = mapped_column(BOOLEAN, nullable=False, default=False, doc='정답 여부')
@@ -54,12 +72,16 @@ class Selection(Base):
 # 문제 풀이 로그 관련 테이블
 class QuestionLog(Base):
     __tablename__ = "question_log"
-    __table_args__ = {'schema': 'pro'}
+    __table_args__ = (
+        # 사용자 별 퀴즈 (문제) 답안 조회
+        Index('question_log_user_id_question_id_idx', 'user_id', 'question_id'),
+        {'schema': 'pro'}
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("pro.user.id"), nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("pro.user.id"), nullable=False)
     question_id: Mapped[int] = mapped_column(ForeignKey("pro.question.id"), nullable=False, index=True)
-    user_answer: Mapped[str] = mapped_column(TEXT, nullable=False, doc='유저가 선택한 정답')
+    user_answer: Mapped[List[int]] = mapped_column(ARRAY(BigInteger), nullable=False, doc='유저가 선택한 정답 (정렬된 보기 PK)')
     is_correct: Mapped[bool] = mapped_column(BOOLEAN, nullable=False, default=False, doc='정답 여부')
 
     user = relationship("User", backref=backref("question_log"))
@@ -68,23 +90,61 @@ class QuestionLog(Base):
 
 class QuizVersion(Base):
     __tablename__ = "quiz_version"
-    __table_args__ = {'schema': 'pro'}
+    __table_args__ = (
+        # 퀴즈 별 버전 조회 (퀴즈 진입 / 버전 별 문제 구성 조회)
+        UniqueConstraint('quiz_id', 'version', name='quiz_version_quiz_id_version_key'),
+        {'schema': 'pro'}
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    quiz_id: Mapped[int] = mapped_column(ForeignKey("pro.quiz.id"), nullable=False, index=True)
+    quiz_id: Mapped[int] = mapped_column(ForeignKey("pro.quiz.id"), nullable=False)
     version: Mapped[int] = mapped_column(Integer, nullable=False)
-    question_ids: Mapped[str] = mapped_column(TEXT, nullable=False, doc='문제 순서')
-    selection_info: Mapped[str] = mapped_column(TEXT, nullable=False, doc='문제 별 보기 순서')
+    question_ids: Mapped[List[int]] = mapped_column(ARRAY(BigInteger), nullable=False, doc='문제 순서')
+    selection_ids: Mapped[List[int]] = mapped_column(ARRAY(BigInteger), nullable=False, doc='문제 순서대로 이어 붙인 문제 별 보기 순서')
+    selection_counts: Mapped[List[int]] = mapped_column(ARRAY(Integer), nullable=False, doc='문제 별 보기 수 (selection_ids 를 나누는 기준)')
 
     quiz = relationship("Quiz", backref=backref("quiz_version"))
 
 
+# 임시 저장 답안을 받은 순서 (워커 / 서버 시각과 무관하게 DB 에서 발급)
+pre_save_revision_seq = Sequence('pre_save_revision_seq', schema='pro')
+
+
 class PreSave(Base):
     __tablename__ = "pre_save"
-    __table_args__ = {'schema': 'pro'}
+    __table_args__ = (
+        # 사용자는 퀴즈 별로 하나의 버전만 지급 받음 (중복 진입 방지)
+        UniqueConstraint('quiz_id', 'user_id', name='pre_save_quiz_id_user_id_key'),
+        {'schema': 'pro'}
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    quiz_id: Mapped[int] = mapped_column(ForeignKey("pro.quiz.id"), nullable=False, index=True)
+    quiz_id: Mapped[int] = mapped_column(ForeignKey("pro.quiz.id"), nullable=False)
     quiz_version_id: Mapped[int] = mapped_column(ForeignKey("pro.quiz_version.id"), nullable=False, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("pro.user.id"), nullable=False, index=True)
-    answer: Mapped[str] = mapped_column(TEXT, nullable=False, doc='문제 순서')
+    answer: Mapped[dict] = mapped_column(JSONB, nullable=True, doc='문제 별 임시 저장 답안 (question_id : [selection_id, ...])')
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=True, doc='저장된 답안을 받은 순서 (pre_save_revision_seq, 먼저 받은 답안이 덮어쓰지 않도록 비교)')
+
+
+# 사용자 별 퀴즈 응시 상태 테이블 (목록 / 상세 조회 시 QuestionLog 를 집계하지 않기 위한 요약 정보)
+class UserQuizStatus(Base):
+    __tablename__ = "user_quiz_status"
+    __table_args__ = {'schema': 'pro'}
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("pro.user.id"), primary_key=True)
+    quiz_id: Mapped[int] = mapped_column(ForeignKey("pro.quiz.id"), primary_key=True)
+    status: Mapped[int] = mapped_column(SmallInteger, nullable=False, doc='응시 상태 (1 : 최종 제출 / 2 : 진입 혹은 임시 저장)')
+    correct_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, doc='맞힌 문제 수 (최종 제출 시 기록)')
+
+
+# 퀴즈 버전 생성 작업 큐 (퀴즈 생성과 같은 트랜잭션으로 등록, 워커가 FOR UPDATE SKIP LOCKED 로 하나씩 가져가 처리 후 삭제)
+class QuizVersionJob(Base):
+    __tablename__ = "quiz_version_job"
+    __table_args__ = {'schema': 'pro'}
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    quiz_id: Mapped[int] = mapped_column(ForeignKey("pro.quiz.id"), nullable=False, unique=True)
+    status: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0, doc='작업 상태 (0 : 대기 / 1 : 실패 - 최대 시도 횟수 초과)')
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, doc='실패한 횟수')
+    last_error: Mapped[str] = mapped_column(TEXT, nullable=True, doc='마지막 실패 사유')
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now(), doc='다음 시도 가능 시각 (실패 시 재시도 대기 시간만큼 늦춤)')
@@ -13,12 +13,62 @@ class Setting:
     DB_HOST = os.environ.get("DB_HOST")
     DB_NAME = os.environ.get("DB_NAME")
 
+    # 읽기 전용 replica (DB_REPLICA_HOST 가 없으면 모든 쿼리를 primary 에서 실행, 계정 / DB 이름은 primary 와 동일)
+    DB_REPLICA_HOST = os.environ.get("DB_REPLICA_HOST")
+    DB_REPLICA_PORT = os.environ.get("DB_REPLICA_PORT", DB_PORT)
+
+    # DB 커넥션 풀 설정
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 20))
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_CACHE_SIZE = int(os.environ.get("DB_STATEMENT_CACHE_SIZE", 100))
+    DB_WARMUP_CONNECTIONS = int(os.environ.get("DB_WARMUP_CONNECTIONS", 5))
+    # 한 요청이 동시 조회에 사용할 수 있는 최대 커넥션 수 (요청 세션 포함, 1 인 경우 순차 실행)
+    DB_REQUEST_MAX_CONNECTIONS = int(os.environ.get("DB_REQUEST_MAX_CONNECTIONS", 3))
+
     # JWT 설정
     JWT_SECRET = os.environ.get("JWT_SECRET")
     JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM")
 
+    # 캐시 설정
+    QUIZ_CONTENT_CACHE_SIZE = int(os.environ.get("QUIZ_CONTENT_CACHE_SIZE", 512))
+    ANSWER_KEY_CACHE_SIZE = int(os.environ.get("ANSWER_KEY_CACHE_SIZE", 512))
+    QUIZ_COUNT_CACHE_TTL = float(os.environ.get("QUIZ_COUNT_CACHE_TTL", 30))
+
+    # 임시 저장 버퍼 설정 (저장 주기가 0 이하인 경우 버퍼 없이 바로 저장)
+    # 버퍼는 프로세스 별로 존재하므로 한 사용자의 요청이 한 워커로만 가는 배포 (단일 워커 등) 에서만 사용
+    PRE_SAVE_FLUSH_INTERVAL = float(os.environ.get("PRE_SAVE_FLUSH_INTERVAL", 0))
+    PRE_SAVE_FLUSH_BATCH_SIZE = int(os.environ.get("PRE_SAVE_FLUSH_BATCH_SIZE", 1000))
+    AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", 10000))
+    AUTH_USER_CACHE_TTL = float(os.environ.get("AUTH_USER_CACHE_TTL", 60))
+
+    # 최종 제출 group commit 설정 (모으는 시간이 0 이하인 경우 모으지 않고 바로 저장)
+    SUBMIT_GROUP_COMMIT_WINDOW_MS = float(os.environ.get("SUBMIT_GROUP_COMMIT_WINDOW_MS", 0))
+    SUBMIT_GROUP_COMMIT_MAX_BATCH = int(os.environ.get("SUBMIT_GROUP_COMMIT_MAX_BATCH", 500))
+
+    # 퀴즈 버전 생성 워커 설정 (API 프로세스에서 실행하지 않는 경우 python -m app.quiz.version_worker 로 별도 실행)
+    QUIZ_VERSION_WORKER_ENABLED = os.environ.get("QUIZ_VERSION_WORKER_ENABLED", "true").lower() == "true"
+    QUIZ_VERSION_WORKER_POLL_INTERVAL = float(os.environ.get("QUIZ_VERSION_WORKER_POLL_INTERVAL", 1))
+    QUIZ_VERSION_JOB_MAX_ATTEMPTS = int(os.environ.get("QUIZ_VERSION_JOB_MAX_ATTEMPTS", 3))
+    # 실패한 작업의 첫 재시도 대기 시간 (초, 실패할 때마다 2배씩 증가)
+    QUIZ_VERSION_JOB_RETRY_DELAY = float(os.environ.get("QUIZ_VERSION_JOB_RETRY_DELAY", 5))
+    # 퀴즈 생성 시 설정할 수 있는 최대 버전 수
+    QUIZ_MAX_VERSION_COUNT = int(os.environ.get("QUIZ_MAX_VERSION_COUNT", 100))
+
+    # 워커 간 캐시 무효화 (LISTEN / NOTIFY) 설정
+    INVALIDATION_CHANNEL = os.environ.get("INVALIDATION_CHANNEL", "cache_invalidation")
+    INVALIDATION_RECONNECT_INTERVAL = float(os.environ.get("INVALIDATION_RECONNECT_INTERVAL", 1))
+    INVALIDATION_PING_INTERVAL = float(os.environ.get("INVALIDATION_PING_INTERVAL", 30))
+
     @property
     def get_db_url(self):
         return f'postgresql+asyncpg://{self.DB_USER}:{self.DB_PW}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
 
+    @property
+    def get_replica_db_url(self):
+        if not self.DB_REPLICA_HOST:
+            return None
+        return f'postgresql+asyncpg://{self.DB_USER}:{self.DB_PW}@{self.DB_REPLICA_HOST}:{self.DB_REPLICA_PORT}/{self.DB_NAME}'
+
 setting = Setting()
\ No newline at end of file
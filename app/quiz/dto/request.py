@@ -16,6 +16,7 @@ class QuizInfo(BaseModel):
     select_count: int
     pagination_count: int
     is_random: bool
+    version_count: int = 10
     questions: List[QuestionInfoRequest]
 
     class Config:
@@ -25,6 +26,7 @@ class QuizInfo(BaseModel):
                 "select_count": 12,
                 "pagination_count": 2,
                 "is_random": False,
+                "version_count": 10,
                 "questions": [
                     {
                         "name": "대한민국의 수도는?",
@@ -9,6 +9,7 @@ from app.util.pagination import pagination
 class Quizzes(BaseModel):
     page: pagination.Page
     quizzes: List[QuizInfo]
+    next_after: Optional[int] = None
 
     class Config:
         json_schema_extra = {
@@ -27,7 +28,8 @@ class Quizzes(BaseModel):
                         "is_random": True,
                         "status": 0
                     }
-                ]
+                ],
+                "next_after": None
             }
         }
 
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, FrozenSet
 
 from pydantic import BaseModel
 
@@ -32,4 +32,13 @@ class QuestionInfoService(BaseModel):
 
 class UserAnswerInfo(BaseModel):
     question_id: int
-    selection_ids: List[int]
\ No newline at end of file
+    selection_ids: List[int]
+
+class QuizContent(BaseModel):
+    question_ids: List[int]
+    questions: Dict[int, QuestionInfoService]
+
+
+class AnswerKey(BaseModel):
+    select_count: int
+    answers: Dict[int, FrozenSet[int]]
@@ -1,26 +1,31 @@
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
+from app.config.database import database
+from app.config.setting import setting
 from app.quiz.dto.request import QuizInfo, QuizSubmitRequest
 from app.quiz.dto.response import Quizzes, QuizDetail
 from app.util.auth_handler import auth
 from app.util.response_handler import res
 from app.quiz import service
+from app.quiz.version_worker import quiz_version_worker
 
 router = APIRouter(tags=['☑️ QUIZ'], prefix='/quiz')
 
 @router.post(
     path='',
     description='## ✔️️ [퀴즈 생성하기] \n'
-                '''
+                f'''
                 ## Request Detail ##
                 
                 - name : 퀴즈 이름
                 - select_count : 설정한 문제 갯수 (출제 문제 수)
                 - pagination_count : 목록에 보여질 문제의 수 (페이지 네이션에서 활용)
                 - is_random : 출제 시 문제 + 보기 랜덤 출제 여부
+                - version_count : 랜덤 출제 시 미리 만들어 둘 문제 배치 버전 수 (default = 10, 1 ~ QUIZ_MAX_VERSION_COUNT 설정값, 현재 {setting.QUIZ_MAX_VERSION_COUNT})
                 
                 * Question
                 - name : 문항, 문제 내용
@@ -79,19 +84,30 @@ router = APIRouter(tags=['☑️ QUIZ'], prefix='/quiz')
                     }
                 }
             }
+        },
+        448: {
+            "description": "설정한 버전 수가 허용 범위를 벗어난 경우 (최대값은 QUIZ_MAX_VERSION_COUNT 설정, default = 100)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": f"버전 수는 1 이상 {setting.QUIZ_MAX_VERSION_COUNT} 이하로 설정해야 합니다."
+                    }
+                }
+            }
         }
     }
 )
 async def add_quiz(
         request: QuizInfo,
-        task: BackgroundTasks,
         user=Depends(auth.auth_wrapper),
+        db: AsyncSession = Depends(database.get_db)
 ):
     if not user.is_admin:
         return res.post_exception(status.HTTP_401_UNAUTHORIZED, "권한이 존재하지 않습니다.")
 
     result =  await service.save_new_quiz(
-        request.name, request.select_count, request.pagination_count, request.is_random, request.questions
+        db, request.name, request.select_count, request.pagination_count, request.is_random,
+        request.version_count, request.questions
     )
 
     # 문제가 존재하지 않은 경우
@@ -110,8 +126,12 @@ async def add_quiz(
     elif result == -4:
         return res.post_exception(447, "정답이 없는 문제가 존재합니다.")
 
-    # 백그라운드 task 추가하기
-    task.add_task(service.quiz_version_update, result)
+    # 설정한 버전 수가 허용 범위를 벗어난 경우
+    elif result == -5:
+        return res.post_exception(448, f"버전 수는 1 이상 {setting.QUIZ_MAX_VERSION_COUNT} 이하로 설정해야 합니다.")
+
+    # 버전 생성 작업은 퀴즈와 함께 저장되어 있으므로 워커만 깨움 (워커가 별도 프로세스인 경우 주기적으로 확인)
+    quiz_version_worker.wake()
     return res.post_success()
 
 
@@ -122,6 +142,7 @@ async def add_quiz(
                 ## Request Detail ##
                 page : 현재 페이지 (default = 1)
                 limit : 목록에 보여질 퀴즈의 수 (default = 5)
+                after : 이전 목록 응답의 next_after 값 (cursor 방식 조회, 값이 있으면 page 대신 사용)
                 
                 
                 ## Response Detail ##
@@ -144,16 +165,20 @@ async def add_quiz(
                     - 1 : 사용자 권한 + 해당 퀴즈의 문제를 모두 풀고 제출한 이력이 있음
                     - 2 : 사용자 권한 + 해당 퀴즈의 특정 문제를 풀고 제출하진 않음 (중간 저장 단계)
                 
+                * next_after : 다음 목록 조회 시 after 로 넘길 값 (마지막 목록인 경우 Null)
+                
                 ''',
     response_model=Quizzes
 )
 async def get_all_quiz(
         limit: Optional[int] = 2,
         page: Optional[int] = 1,
-        user=Depends(auth.auth_wrapper)
+        after: Optional[int] = None,
+        user=Depends(auth.auth_wrapper),
+        db: AsyncSession = Depends(database.get_db)
 ):
-    page, quizzes = await service.get_all_quiz_by_auth(limit, page, user)
-    return Quizzes(page=page, quizzes=quizzes)
+    page, quizzes, next_after = await service.get_all_quiz_by_auth(db, limit, page, after, user)
+    return Quizzes(page=page, quizzes=quizzes, next_after=next_after)
 
 
 @router.get(
@@ -197,17 +222,36 @@ async def get_all_quiz(
                 - name : 보기 내용
                 - is_correct : 보기 정답 여부 (True 정답 / False 오답)
                 ''',
-    response_model=QuizDetail
+    response_model=QuizDetail,
+    responses={
+        409: {
+            "description": "퀴즈 버전이 아직 생성되지 않은 경우 (사용자)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "퀴즈를 준비 중입니다. 잠시 후 다시 시도해주세요."
+                    }
+                }
+            }
+        }
+    }
 )
 async def get_quiz_detail(
         quiz_id: int,
         page: Optional[int] = 1,
-        user=Depends(auth.auth_wrapper)
+        user=Depends(auth.auth_wrapper),
+        db: AsyncSession = Depends(database.get_db)
 ):
+    result = await service.get_quiz_detail(db, quiz_id, user, page)
+
+    # 퀴즈 버전이 아직 생성되지 않은 경우
+    if result == -1:
+        return res.post_exception(status.HTTP_409_CONFLICT, "퀴즈를 준비 중입니다. 잠시 후 다시 시도해주세요.")
+
     (
         quiz_name, total_question_count, question_count, pagination_count,
-        is_random, status, correct_question_count, page, user_answers, questions
-    ) = await service.get_quiz_detail(quiz_id, user, page)
+        is_random, quiz_status, correct_question_count, page, user_answers, questions
+    ) = result
 
     return QuizDetail(
         id=quiz_id,
@@ -266,12 +310,72 @@ async def get_quiz_detail(
 async def quiz_pre_save(
         quiz_id: int,
         request: List[QuizSubmitRequest],
-        user=Depends(auth.auth_wrapper)
+        user=Depends(auth.auth_wrapper),
+        db: AsyncSession = Depends(database.get_db)
+):
+    if user.is_admin:
+        return res.post_exception(status.HTTP_401_UNAUTHORIZED, "사용자 권한이 존재하지 않습니다.")
+
+    result = await service.update_pre_save_data(db, quiz_id, user.id, request)
+
+    # 사용자가 해당 퀴즈를 최종 제출한 이력이 존재하는 경우
+    if result == -1:
+        return res.post_exception(status.HTTP_409_CONFLICT, "해당 퀴즈의 최종 제출 이력이 있어 임시저장이 불가능합니다.")
+    return res.post_success()
+
+
+@router.patch(
+    path='/{quiz_id}/pre-save',
+    description='## ✔️️ [퀴즈 임시 저장 - 변경된 답안만 저장] \n'
+                '''
+                ## Request Detail ##
+                - 답안이 변경된 문제만 전달 (기존에 임시 저장된 다른 문제의 답안은 유지)
+                - question_id : 문제 PK
+                - selection_ids : 사용자가 정답이라고 택한 보기의 PK List
+                ''',
+    responses={
+        status.HTTP_201_CREATED: {
+            "description": "퀴즈 임시 저장 성공",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "success"
+                    }
+                }
+            }
+        },
+        401: {
+            "description": "관리자 권한인 경우",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "사용자 권한이 존재하지 않습니다."
+                    }
+                }
+            }
+        },
+        409: {
+            "description": "사용자가 해당 퀴즈를 최종 제출한 이력이 존재하는 경우",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "해당 퀴즈의 최종 제출 이력이 있어 임시저장이 불가능합니다."
+                    }
+                }
+            }
+        }
+    }
+)
+async def quiz_pre_save_changes(
+        quiz_id: int,
+        request: List[QuizSubmitRequest],
+        user=Depends(auth.auth_wrapper),
+        db: AsyncSession = Depends(database.get_db)
 ):
     if user.is_admin:
         return res.post_exception(status.HTTP_401_UNAUTHORIZED, "사용자 권한이 존재하지 않습니다.")
 
-    result = await service.update_pre_save_data(quiz_id, user.id, request)
+    result = await service.merge_pre_save_data(db, quiz_id, user.id, request)
 
     # 사용자가 해당 퀴즈를 최종 제출한 이력이 존재하는 경우
     if result == -1:
@@ -333,12 +437,13 @@ async def quiz_pre_save(
 async def quiz_final_submit(
         quiz_id: int,
         request: List[QuizSubmitRequest],
-        user=Depends(auth.auth_wrapper)
+        user=Depends(auth.auth_wrapper),
+        db: AsyncSession = Depends(database.get_db)
 ):
     if user.is_admin:
         return res.post_exception(status.HTTP_401_UNAUTHORIZED, "사용자 권한이 존재하지 않습니다.")
 
-    result = await service.final_submit_quiz_answer(quiz_id, user.id, request)
+    result = await service.final_submit_quiz_answer(db, quiz_id, user.id, request)
 
     # 사용자가 해당 퀴즈를 최종 제출한 이력이 존재하는 경우
     if result == -1:
@@ -0,0 +1,170 @@
+import asyncio
+import json
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.database import database
+from app.config.invalidation import invalidation_bus, InvalidationEvent, InvalidationType
+from app.config.setting import setting
+from app.quiz import repository
+
+
+class PreSaveBuffer:
+    '''
+    @ 임시 저장 답안 write-behind 버퍼
+    - (user_idx, quiz_id) 별로 마지막 답안만 보관 (last-write-wins)
+    - 변경된 문제의 답안만 들어온 경우 (merge) 버퍼 안에서 병합 후 저장 시 DB 답안에 병합
+    - flush_interval 초마다 모인 답안을 batch_size 단위로 한 번에 저장
+    - 사용자가 최종 제출하거나 프로세스가 종료될 때도 저장
+    - flush_interval 이 0 이하인 경우 버퍼를 사용하지 않고 바로 저장 (default)
+    - 버퍼는 프로세스 별로 존재하므로 여러 워커로 실행하는 경우 다른 워커의 조회에는 버퍼의 답안이 보이지 않음
+      (한 사용자의 요청이 한 워커로만 가는 경우에만 사용)
+    - 답안을 받을 때 DB sequence 로 받은 순서 (revision) 를 발급하여, 전체 답안 저장 시 더 나중에 받은 답안이
+      이미 저장되어 있으면 덮어쓰지 않음 (서버 시각을 비교하지 않으므로 워커 간 시각 차이에 영향을 받지 않음)
+      변경된 문제의 답안 (merge) 은 서로 다른 문제일 수 있으므로 순서와 관계없이 병합
+
+    :param flush_interval: 저장 주기 (초)
+    :param batch_size: 한 번에 저장할 최대 답안 수
+    '''
+
+    def __init__(self, flush_interval: float, batch_size: int):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        # (user_idx, quiz_id) : (전체 답안 여부, {question_id : [selection_id, ...]}, 마지막으로 받은 답안의 revision)
+        self._pending: Dict[Tuple[int, int], Tuple[bool, dict, int]] = {}
+        # 저장 중인 답안 (저장이 끝나기 전까지 조회 시 반영)
+        self._flushing: Dict[Tuple[int, int], Tuple[bool, dict, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Future] = None
+
+    @property
+    def enabled(self):
+        return self.flush_interval > 0
+
+    def apply(self, user_idx: int, quiz_id: int, stored_answer: Optional[dict]) -> Optional[dict]:
+        '''
+        @ DB 에 저장된 답안에 아직 저장되지 않은 답안을 반영하여 return
+
+        :param stored_answer: DB 에 저장된 임시 저장 답안 (question_id : [selection_id, ...] 혹은 None)
+        '''
+        answer = stored_answer
+        for entries in (self._flushing, self._pending):
+            pending = entries.get((user_idx, quiz_id))
+            if pending is None:
+                continue
+
+            is_full, pending_answer, _ = pending
+            answer = dict(pending_answer) if is_full or answer is None else {**answer, **pending_answer}
+        return answer
+
+    async def put(self, db: AsyncSession, user_idx: int, quiz_id: int, answer: dict):
+        '''
+        @ 전체 답안 저장 (기존 답안을 덮어씀)
+        '''
+        if not self.enabled:
+            await repository.update_pre_save_data(db, [(user_idx, quiz_id, json.dumps(answer), None)])
+            return
+
+        revision = await repository.next_pre_save_revision(db)
+        self._pending[(user_idx, quiz_id)] = (True, dict(answer), revision)
+
+    async def merge(self, db: AsyncSession, user_idx: int, quiz_id: int, answer: dict):
+        '''
+        @ 변경된 문제의 답안만 기존 답안에 병합
+        '''
+        if not self.enabled:
+            await repository.update_pre_save_data(db, [(user_idx, quiz_id, json.dumps(answer), None)], merge=True)
+            return
+
+        revision = await repository.next_pre_save_revision(db)
+        is_full, pending_answer, _ = self._pending.get((user_idx, quiz_id), (False, {}, revision))
+        self._pending[(user_idx, quiz_id)] = (is_full, {**pending_answer, **answer}, revision)
+
+    async def flush_user(self, db: AsyncSession, user_idx: int, quiz_id: int):
+        pending = self._pending.pop((user_idx, quiz_id), None)
+        if pending is not None:
+            is_full, answer, revision = pending
+            await repository.update_pre_save_data(
+                db, [(user_idx, quiz_id, json.dumps(answer), revision)], merge=not is_full
+            )
+
+    def discard(self, user_idx: int, quiz_id: int):
+        # 최종 제출된 퀴즈의 답안은 저장할 필요가 없으므로 제거
+        self._pending.pop((user_idx, quiz_id), None)
+
+    async def flush(self):
+        pending, self._pending = self._pending, {}
+        self._flushing = pending
+        items = list(pending.items())
+
+        start = 0
+        try:
+            while start < len(items):
+                batch = items[start:start + self.batch_size]
+                try:
+                    # 요청과 무관하게 실행되므로 별도 세션 사용
+                    async with database.session_factory() as db:
+                        for merge in (False, True):
+                            pre_save_answers = [
+                                (user_idx, quiz_id, json.dumps(answer), revision)
+                                for (user_idx, quiz_id), (is_full, answer, revision) in batch if is_full != merge
+                            ]
+                            if len(pre_save_answers) != 0:
+                                await repository.update_pre_save_data(db, pre_save_answers, merge=merge)
+                except Exception as e:
+                    print(f"Pre-save flush failed: {e}")
+                    break
+                start += self.batch_size
+        finally:
+            # 저장하지 못한 답안 (실패 혹은 취소된 경우 남은 배치) 은 다시 보관
+            self._requeue(items[start:])
+            self._flushing = {}
+
+    def _requeue(self, items):
+        # 저장에 실패한 답안은 그 사이 새로 들어온 전체 답안이 없는 경우에만 다시 보관
+        for key, (is_full, answer, revision) in items:
+            newer = self._pending.get(key)
+            if newer is None:
+                self._pending[key] = (is_full, answer, revision)
+            elif not newer[0]:
+                self._pending[key] = (is_full, {**answer, **newer[1]}, newer[2])
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # 종료 시 task 가 취소되어도 진행 중인 저장은 중단하지 않음 (stop 에서 끝날 때까지 기다림)
+            self._flush_task = asyncio.ensure_future(self.flush())
+            await asyncio.shield(self._flush_task)
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._flush_task is not None:
+            await self._flush_task
+            self._flush_task = None
+
+        # 진행 중이던 저장이 끝난 뒤 남은 답안 (저장 중 새로 들어온 답안 포함) 저장
+        await self.flush()
+
+
+pre_save_buffer = PreSaveBuffer(setting.PRE_SAVE_FLUSH_INTERVAL, setting.PRE_SAVE_FLUSH_BATCH_SIZE)
+
+
+def on_quiz_submitted(event: InvalidationEvent):
+    # 다른 워커에서 최종 제출된 경우 이 워커에 남아 있는 임시 저장 답안 제거 (전체 제거 이벤트는 무시)
+    if event.user_id is not None and event.quiz_id is not None:
+        pre_save_buffer.discard(event.user_id, event.quiz_id)
+
+
+invalidation_bus.subscribe(InvalidationType.QUIZ_SUBMITTED, on_quiz_submitted)
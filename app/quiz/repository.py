@@ -1,16 +1,22 @@
-import json
-from typing import List
+import asyncio
+from typing import List, Optional, Tuple
 
-from sqlalchemy import update, desc
-from sqlalchemy.sql import func, select, case
+from sqlalchemy import update, delete, desc, insert, and_, or_, case, any_, null, bindparam, cast, literal, literal_column, BigInteger, Integer, Float, BOOLEAN, TEXT
+from sqlalchemy.dialects.postgresql import insert as pg_insert, ARRAY, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func, select
 
 from app.config.database import database
-from app.config.model import Quiz, Question, Selection, QuestionLog, QuizVersion, PreSave
-from app.quiz.dto.request import QuestionInfoRequest, QuizSubmitRequest
+from app.config.invalidation import invalidation_bus, InvalidationEvent, InvalidationType
+from app.config.model import Quiz, Question, Selection, QuestionLog, QuizVersion, PreSave, UserQuizStatus, QuizVersionJob, \
+    pre_save_revision_seq
+from app.config.setting import setting
+from app.quiz.dto.request import QuestionInfoRequest
 
 
 async def save_new_quiz(
-        name: str, select_count: int, pagination_count:int, is_random: bool, questions: List[QuestionInfoRequest]
+        db: AsyncSession, name: str, select_count: int, pagination_count:int, is_random: bool, version_count: int,
+        questions: List[QuestionInfoRequest]
 ) -> int:
     # 문제가 존재하지 않은 경우
     if len(questions) == 0:
@@ -20,190 +26,209 @@ async def save_new_quiz(
     if len(questions) < select_count:
         return -2
 
+    # 버전 수가 허용 범위를 벗어난 경우 (버전은 모두 메모리에서 만든 뒤 저장하므로 상한 필요)
+    if not 1 <= version_count <= setting.QUIZ_MAX_VERSION_COUNT:
+        return -5
+
+    # SQL 실행 전에 보기 정보를 모두 검증 (검증 실패 시 트랜잭션이 열리지 않음)
+    for question in questions:
+        # 보기가 2개 미만인 경우
+        if len(question.selections) < 2:
+            return -3
+
+        # 정답이 존재하지 않은 경우
+        if not any(selection.is_correct for selection in question.selections):
+            return -4
+
+    new_quiz = Quiz(
+        name=name,
+        q_count=len(questions),
+        s_count=select_count,
+        p_count=pagination_count,
+        v_count=version_count,
+        is_random=is_random
+    )
 
-    async with database.session_factory() as db:
-        new_quiz = Quiz(
-            name=name,
-            q_count=len(questions),
-            s_count=select_count,
-            p_count=pagination_count,
-            is_random=is_random
-        )
-
-        db.add(new_quiz)
-        await db.flush()
-
-        for question_idx in range(len(questions)):
-            q_name, selections = questions[question_idx].name, questions[question_idx].selections
-
-            new_question = Question(
-                quiz_id=new_quiz.id,
-                name=q_name,
-                sequence=question_idx+1
-            )
-            db.add(new_question)
-            await db.flush()
-
-            # 보기가 2개 미만인 경우
-            if len(selections) < 2:
-                return -3
-
-            is_exist_answer = False
-            for selection_idx in range(len(selections)):
-                s_name, is_correct = selections[selection_idx].name, selections[selection_idx].is_correct
-
-                db.add(Selection(
-                    question_id=new_question.id,
-                    name=s_name,
-                    sequence=selection_idx+1,
-                    is_correct=is_correct
-                ))
-
-                is_exist_answer = True if is_correct else is_exist_answer
+    db.add(new_quiz)
+    await db.flush()
+
+    # 문제는 multi-row INSERT ... RETURNING 한 번으로 저장 (sequence 기준으로 PK 매핑)
+    question_result = await db.execute(
+        insert(Question)
+        .values([
+            {
+                'quiz_id': new_quiz.id,
+                'name': question.name,
+                'sequence': question_idx + 1
+            } for question_idx, question in enumerate(questions)
+        ])
+        .returning(Question.id, Question.sequence)
+    )
+    question_id_by_sequence = {sequence: question_id for question_id, sequence in question_result.fetchall()}
+
+    # 보기는 executemany 한 번으로 저장
+    await db.execute(
+        insert(Selection),
+        [
+            {
+                'question_id': question_id_by_sequence[question_idx + 1],
+                'name': selection.name,
+                'sequence': selection_idx + 1,
+                'is_correct': selection.is_correct
+            }
+            for question_idx, question in enumerate(questions)
+            for selection_idx, selection in enumerate(question.selections)
+        ]
+    )
 
-            # 정답이 존재하지 않은 경우
-            if not is_exist_answer:
-                return -4
+    # 버전 생성 작업을 같은 트랜잭션으로 등록 (퀴즈가 저장되면 작업도 반드시 남음)
+    db.add(QuizVersionJob(quiz_id=new_quiz.id))
+    await invalidation_bus.publish(db, [InvalidationEvent(type=InvalidationType.QUIZ_CREATED, quiz_id=new_quiz.id)])
 
-        await db.commit()
-        return new_quiz.id
+    await db.commit()
+    return new_quiz.id
 
 
-async def get_all_quiz_by_auth_and_limit(limit: int, page: int, user_idx: int, is_admin: bool):
+async def get_all_quiz_by_auth_and_limit(
+        db: AsyncSession, limit: int, page: int, after: Optional[int], user_idx: int, is_admin: bool
+):
     quiz_sql = (
         select(
             Quiz.id.label("id"),
             Quiz.name.label("name"),
             Quiz.s_count.label("question_count"),
-            func.count(Question.id.distinct()).label("total_question_count"),
+            Quiz.q_count.label("total_question_count"),
             Quiz.p_count.label("pagination_count"),
             Quiz.is_random.label("is_random"),
 
             # 관리자인 경우 null / 퀴즈를 안 푼 경우 0 / 푼 경우 1 / 임시 저장 2
-            case(
-                (is_admin == True, None),
-                (
-                    func.exists(
-                        select(1).select_from(QuestionLog)
-                        .join(Question, QuestionLog.question_id == Question.id)
-                        .where(
-                            QuestionLog.user_id == user_idx,
-                            Question.quiz_id == Quiz.id
-                        ).scalar_subquery()
-                    ),
-                    1  # QuestionLog에 존재 == 퀴즈를 최종 제출한 이력이 있음
-                ),
-                (
-                    func.exists(
-                        select(1).select_from(PreSave)
-                        .where(
-                            PreSave.user_id == user_idx,
-                            PreSave.quiz_id == Quiz.id
-                        ).scalar_subquery()
-                    ),
-                    2  # PreSave 존재 == 중간 저장 혹은 해당 퀴즈의 상세 페이지에 접근한 적이 있음
-                ),
-                else_=0  # 그 외 상태 0
-            ).label("status")
+            (null() if is_admin else func.coalesce(UserQuizStatus.status, 0)).label("status")
         )
-        .select_from(Question)
-        .join(Quiz, Question.quiz_id == Quiz.id)
-        .group_by(Quiz.id)
+        .select_from(Quiz)
         .order_by(desc(Quiz.id))
-        .offset((page-1) * limit)
         .limit(limit)
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(
-            select(func.count(Quiz.id))
+    if not is_admin:
+        quiz_sql = quiz_sql.outerjoin(
+            UserQuizStatus,
+            and_(
+                UserQuizStatus.quiz_id == Quiz.id,
+                UserQuizStatus.user_id == user_idx
+            )
         )
-        quiz_result = await db.execute(quiz_sql)
 
-        return result.scalar(), quiz_result.fetchall()
+    # after 가 있는 경우 cursor(keyset) 방식, 없는 경우 page 기준 offset 방식
+    if after is not None:
+        quiz_sql = quiz_sql.where(Quiz.id < after)
+    else:
+        quiz_sql = quiz_sql.offset((page-1) * limit)
+
+    quiz_result = await db.execute(quiz_sql)
+    return quiz_result.fetchall()
+
+
+async def get_quiz_count(db: AsyncSession):
+    result = await db.execute(
+        select(func.count(Quiz.id))
+    )
+    return result.scalar()
+
 
+async def get_question_page_by_quiz_id(db: AsyncSession, quiz_id: int, limit: int, offset: int):
+    '''
+    @ 퀴즈의 문제를 sequence 순서로 한 페이지만 조회 + 페이지에 포함된 문제의 보기를 함께 조회 (관리자 상세 조회)
+    - (quiz_id, sequence) 인덱스로 페이지 범위만 읽으므로 퀴즈의 전체 문제 수와 상관없이 페이지 크기만큼만 조회
 
-async def get_quiz_info_by_id(quiz_id: int):
-    questions_stmt = (
+    :return: [(question_id, question_name, [보기, ...]), ...] - 문제는 sequence 순서, 보기는 sequence 순서
+    '''
+    page_questions = (
         select(
-            Question.id.label("id"),
-            Question.name.label("name")
+            Question.id,
+            Question.name,
+            Question.sequence
         )
         .where(Question.quiz_id == quiz_id)
         .order_by(Question.sequence)
+        .limit(limit)
+        .offset(offset)
+        .subquery()
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(questions_stmt)
-        return result.fetchall()
+    stmt = (
+        select(
+            page_questions.c.id.label("question_id"),
+            page_questions.c.name.label("question_name"),
+            Selection.id.label("id"),
+            Selection.name.label("name"),
+            Selection.is_correct.label("is_correct")
+        )
+        .select_from(page_questions)
+        .join(Selection, Selection.question_id == page_questions.c.id)
+        .order_by(page_questions.c.sequence, Selection.sequence)
+    )
+
+    result = await db.execute(stmt)
 
+    questions = {}
+    for row in result.fetchall():
+        questions.setdefault((row.question_id, row.question_name), []).append(row)
+    return [(question_id, question_name, selections) for (question_id, question_name), selections in questions.items()]
 
-async def get_quiz_info_by_id_and_user(quiz_id: int, user_idx: int, is_admin: bool):
+
+async def get_quiz_info_by_id_and_user(db: AsyncSession, quiz_id: int, user_idx: int, is_admin: bool):
     quiz_stmt = (
         select(
             Quiz.name,
-            func.count(Question.id),
+            Quiz.q_count,
             Quiz.s_count,
             Quiz.p_count,
             Quiz.is_random,
+            Quiz.is_ready,
             # status : 관리자인 경우 null / 퀴즈를 안 푼 경우 0 / 푼 경우 1 / 임시 저장 2
-            case(
-                (is_admin == True, None),
-                (
-                    func.exists(
-                        select(1).select_from(QuestionLog)
-                        .join(Question, QuestionLog.question_id == Question.id)
-                        .where(
-                            QuestionLog.user_id == user_idx,
-                            QuestionLog.question_id == Question.id
-                        ).scalar_subquery()
-                    ),
-                    1  # QuestionLog에 존재 == 퀴즈를 푼 적이 있음
-                ),
-                else_=0  # 그 외 상태 0
-            ).label("status"),
+            (null() if is_admin else func.coalesce(UserQuizStatus.status, 0)).label("status"),
             # correct_question_count : 유저 별 해당 퀴즈에서 맞힌 문제 수
-            (
-                select(
-                    func.count(QuestionLog.id)
-                ).select_from(QuestionLog)
-                .join(Question, QuestionLog.question_id == Question.id)
-                .where(
-                    Question.quiz_id == quiz_id,
-                    QuestionLog.user_id == user_idx,
-                    QuestionLog.is_correct == True
-                ).scalar_subquery()
-            ).label("correct_question_count")
-        ).select_from(Question)
-        .join(Quiz, Question.quiz_id == Quiz.id)
+            func.coalesce(UserQuizStatus.correct_count, 0).label("correct_question_count")
+        ).select_from(Quiz)
+        .outerjoin(
+            UserQuizStatus,
+            and_(
+                UserQuizStatus.quiz_id == Quiz.id,
+                UserQuizStatus.user_id == user_idx
+            )
+        )
         .where(Quiz.id == quiz_id)
-        .group_by(Quiz.id)
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(quiz_stmt)
-        return result.fetchone()
+    result = await db.execute(quiz_stmt)
+    return result.fetchone()
 
 
-async def get_selections_by_question_id_and_is_random(question_id: int):
+async def get_selections_by_question_ids(db: AsyncSession, question_ids: List[int]):
+    # 페이지에 포함된 모든 문제의 보기를 한 번에 조회 (question_id : [보기, ...], 보기는 sequence 순서)
     stmt = (
         select(
+            Selection.question_id,
             Selection.id.label("id"),
             Selection.name.label("name"),
             Selection.is_correct.label("is_correct")
         )
-        .where(Selection.question_id == question_id)
-        .order_by(Selection.sequence)
+        # id 목록을 하나의 배열 파라미터로 전달하여 목록의 길이 / 값과 상관없이 같은 SQL 사용
+        .where(Selection.question_id == any_(bindparam('question_ids', question_ids, type_=ARRAY(BigInteger))))
+        .order_by(Selection.question_id, Selection.sequence)
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(stmt)
-        return result.fetchall()
+    result = await db.execute(stmt)
 
+    selections = {}
+    for selection in result.fetchall():
+        selections.setdefault(selection.question_id, []).append(selection)
+    return selections
 
-async def get_quiz_is_random_and_question_ids_by_quiz_id(quiz_id: int):
+
+async def get_quiz_is_random_and_question_ids_by_quiz_id(db: AsyncSession, quiz_id: int):
     quiz_stmt = (
-        select(Quiz.is_random, Quiz.s_count)
+        select(Quiz.is_random, Quiz.s_count, Quiz.v_count)
         .select_from(Quiz)
         .where(Quiz.id == quiz_id)
     )
@@ -212,92 +237,183 @@ async def get_quiz_is_random_and_question_ids_by_quiz_id(quiz_id: int):
         select(Question.id)
         .select_from(Question)
         .where(Question.quiz_id == quiz_id)
+        .order_by(Question.sequence)
     )
 
-    async with database.session_factory() as db:
-        quiz_result = await db.execute(quiz_stmt)
-        question_result = await db.execute(question_stmt)
+    quiz_result = await db.execute(quiz_stmt)
+    question_result = await db.execute(question_stmt)
 
-        is_random, s_count = quiz_result.fetchone()
-        question_ids = question_result.scalars().all()
+    is_random, s_count, v_count = quiz_result.fetchone()
+    question_ids = question_result.scalars().all()
 
-    return is_random, s_count, question_ids
+    return is_random, s_count, v_count, question_ids
 
 
-async def get_selection_ids_by_question_id(question_id: int):
+async def get_selection_ids_by_quiz_id(db: AsyncSession, quiz_id: int):
+    # 퀴즈에 속한 모든 문제의 보기 PK를 한 번에 조회 (question_id : [selection_id, ...])
     stmt = (
-        select(Selection.id)
-        .where(Selection.question_id == question_id)
+        select(Selection.question_id, Selection.id)
+        .join(Question, Selection.question_id == Question.id)
+        .where(Question.quiz_id == quiz_id)
+        .order_by(Selection.question_id, Selection.sequence)
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(stmt)
-        return result.scalars().all()
+    result = await db.execute(stmt)
+
+    selection_ids = {}
+    for question_id, selection_id in result.fetchall():
+        selection_ids.setdefault(question_id, []).append(selection_id)
+    return selection_ids
+
+
+async def add_quiz_versions(db: AsyncSession, quiz_id: int, versions: List[Tuple[List, dict]]):
+    if len(versions) == 0:
+        return
+
+    # 문제 별 보기 순서는 문제 순서대로 이어 붙인 배열 + 문제 별 보기 수로 저장
+    await db.execute(
+        insert(QuizVersion),
+        [
+            {
+                'quiz_id': quiz_id,
+                'version': version_num,
+                'question_ids': list(question_info),
+                'selection_ids': [
+                    selection_id for question_id in question_info for selection_id in selection_info[question_id]
+                ],
+                'selection_counts': [len(selection_info[question_id]) for question_id in question_info]
+            } for version_num, (question_info, selection_info) in enumerate(versions, start=1)
+        ]
+    )
 
 
-async def add_quiz_version(quiz_id: int, version_num: int, question_info: List, selection_info: dict):
-    async with database.session_factory() as db:
-        db.add(QuizVersion(
-            quiz_id=quiz_id,
-            version=version_num,
-            question_ids=json.dumps(question_info),
-            selection_info=json.dumps(selection_info)
-        ))
-        await db.commit()
+async def claim_quiz_version_job(db: AsyncSession):
+    '''
+    @ 대기 중인 버전 생성 작업 하나를 행 잠금으로 가져옴
+    - 다른 워커가 처리 중인 (잠긴) 작업은 건너뛰므로 여러 워커가 동시에 실행되어도 같은 작업을 처리하지 않음
+    - 실패 후 재시도 대기 중인 (next_attempt_at 이 지나지 않은) 작업은 가져가지 않음
+    - 잠금은 commit / rollback 시 해제되므로 처리 중 워커가 종료되면 작업은 다시 대기 상태가 됨
 
+    :return: (작업 PK, 퀴즈 PK) 혹은 None
+    '''
+    stmt = (
+        select(QuizVersionJob.id, QuizVersionJob.quiz_id)
+        .where(
+            QuizVersionJob.status == 0,
+            QuizVersionJob.next_attempt_at <= func.now()
+        )
+        .order_by(QuizVersionJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
 
-async def get_max_quiz_version_by_quiz_id(quiz_id: int):
-    async with database.session_factory() as db:
-        result = await db.execute(
-            select(func.max(QuizVersion.version))
-            .where(QuizVersion.quiz_id == quiz_id)
+    result = await db.execute(stmt)
+    return result.fetchone()
+
+
+async def complete_quiz_version_job(db: AsyncSession, job_id: int, quiz_id: int):
+    # 버전 저장과 같은 트랜잭션에서 퀴즈를 준비 완료로 변경 + 작업 삭제
+    await db.execute(update(Quiz).where(Quiz.id == quiz_id).values(is_ready=True))
+    await db.execute(delete(QuizVersionJob).where(QuizVersionJob.id == job_id))
+    await invalidation_bus.publish(db, [InvalidationEvent(type=InvalidationType.QUIZ_VERSIONS_READY, quiz_id=quiz_id)])
+    await db.commit()
+
+
+async def fail_quiz_version_job(db: AsyncSession, job_id: int, error: str, max_attempts: int, retry_delay: float):
+    # 실패 횟수 기록 (max_attempts 회 실패한 작업은 실패 상태로 남겨 다시 가져가지 않음)
+    # 다음 시도는 retry_delay * 2^(이전 실패 횟수) 초 뒤로 미룸 (일시적인 장애로 시도 횟수를 바로 소진하지 않도록)
+    await db.execute(
+        update(QuizVersionJob)
+        .where(QuizVersionJob.id == job_id)
+        .values(
+            attempts=QuizVersionJob.attempts + 1,
+            status=case((QuizVersionJob.attempts + 1 >= max_attempts, 1), else_=0),
+            last_error=error,
+            next_attempt_at=func.now() + func.make_interval(
+                0, 0, 0, 0, 0, 0, literal(retry_delay, Float) * func.power(2, QuizVersionJob.attempts)
+            )
         )
-        return result.scalar()
+    )
+    await db.commit()
+
 
+async def requeue_failed_quiz_version_jobs(db: AsyncSession, quiz_ids: Optional[List[int]] = None) -> int:
+    '''
+    @ 실패 상태 (최대 시도 횟수 초과) 의 버전 생성 작업을 다시 대기 상태로 변경 (시도 횟수 초기화, 바로 처리)
 
-async def update_quiz_version_by_user(user_idx: int, quiz_id: int, version_num: int):
+    :param quiz_ids: 다시 처리할 퀴즈 PK 목록 (None 인 경우 실패한 작업 전체)
+
+    :return: 다시 대기 상태가 된 작업 수
+    '''
     stmt = (
-        select(QuizVersion.id)
-        .where(
-            QuizVersion.quiz_id == quiz_id,
-            QuizVersion.version == version_num
-        )
+        update(QuizVersionJob)
+        .where(QuizVersionJob.status == 1)
+        .values(status=0, attempts=0, next_attempt_at=func.now())
     )
+    if quiz_ids is not None:
+        stmt = stmt.where(QuizVersionJob.quiz_id.in_(quiz_ids))
 
-    async with database.session_factory() as db:
-        result = await db.execute(stmt)
-        quiz_version_id = result.scalar_one()
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
 
-        db.add(PreSave(
-            user_id=user_idx,
-            quiz_id=quiz_id,
-            quiz_version_id=quiz_version_id,
-            answer=None
-        ))
-        await db.commit()
 
+async def enter_quiz(db: AsyncSession, quiz_id: int, user_idx: int, is_random: bool):
+    '''
+    @ 퀴즈 첫 진입 시 버전 지급 + 진입 상태 기록을 한 번의 쿼리로 처리
+    - 버전은 DB 에서 선택 (랜덤 출제인 경우 생성된 버전 중 랜덤, 아닌 경우 1번 버전)
+    - (quiz_id, user_id) unique 제약으로 이미 지급된 버전이 있으면 아무것도 저장하지 않음
 
-async def not_exist_pre_save_by_quiz_and_user_idx(quiz_id: int, user_idx: int):
-    stmt = (
-        select(func.count(PreSave.id))
-        .where(
-            PreSave.quiz_id == quiz_id,
-            PreSave.user_id == user_idx
+    :return: (version, answer) 혹은 None (동시에 다른 요청이 먼저 진입한 경우)
+    '''
+    version_stmt = (
+        select(
+            literal(user_idx, BigInteger),
+            literal(quiz_id, BigInteger),
+            QuizVersion.id,
+            null()
         )
+        .where(QuizVersion.quiz_id == quiz_id)
+        .order_by(func.random() if is_random else QuizVersion.version)
+        .limit(1)
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(stmt)
-        count = result.scalar_one()
+    entered = (
+        pg_insert(PreSave)
+        .from_select([PreSave.user_id, PreSave.quiz_id, PreSave.quiz_version_id, PreSave.answer], version_stmt)
+        .on_conflict_do_nothing(index_elements=[PreSave.quiz_id, PreSave.user_id])
+        .returning(PreSave.user_id, PreSave.quiz_id, PreSave.quiz_version_id, PreSave.answer)
+        .cte('entered')
+    )
 
-    return True if count == 0 else False
+    # 진입 상태 (2) 기록, 이미 상태가 있는 경우 유지
+    marked = (
+        pg_insert(UserQuizStatus)
+        .from_select(
+            [UserQuizStatus.user_id, UserQuizStatus.quiz_id, UserQuizStatus.status, UserQuizStatus.correct_count],
+            select(entered.c.user_id, entered.c.quiz_id, literal_column('2'), literal_column('0'))
+        )
+        .on_conflict_do_nothing(index_elements=[UserQuizStatus.user_id, UserQuizStatus.quiz_id])
+        .cte('marked')
+    )
+
+    stmt = (
+        select(QuizVersion.version, entered.c.answer)
+        .select_from(entered)
+        .join(QuizVersion, entered.c.quiz_version_id == QuizVersion.id)
+        .add_cte(marked)
+    )
+
+    result = await db.execute(stmt)
+    pre_save = result.fetchone()
+    await db.commit()
+    return pre_save
 
 
-async def get_quiz_version_by_quiz_id_and_user_id(quiz_id: int, user_idx: int):
+async def get_quiz_version_by_quiz_id_and_user_id(db: AsyncSession, quiz_id: int, user_idx: int):
     stmt = (
         select(
-            QuizVersion.question_ids,
-            QuizVersion.selection_info,
+            QuizVersion.version,
             PreSave.answer
         )
         .select_from(PreSave)
@@ -308,90 +424,117 @@ async def get_quiz_version_by_quiz_id_and_user_id(quiz_id: int, user_idx: int):
         )
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(stmt)
-        return result.fetchone()
+    result = await db.execute(stmt)
+    return result.fetchone()
 
 
-async def get_question_info_by_ids(question_ids: List[int]):
+async def get_quiz_version_content(db: AsyncSession, quiz_id: int, version_num: int):
     stmt = (
         select(
-            Question.id,
-            Question.name
+            QuizVersion.question_ids,
+            QuizVersion.selection_ids,
+            QuizVersion.selection_counts
         )
-        .where(Question.id.in_(question_ids))
-        .order_by(
-            case(
-                {
-                    id_value: index for index, id_value in enumerate(question_ids)
-                },
-                value=Question.id,
-                else_=len(question_ids)
-            )
+        .where(
+            QuizVersion.quiz_id == quiz_id,
+            QuizVersion.version == version_num
         )
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(stmt)
-        return result.fetchall() if len(question_ids) != 0 else []
+    result = await db.execute(stmt)
+    return result.one()
 
 
-async def get_selection_info_by_ids(selection_ids: List[int]):
+async def get_question_info_by_ids(db: AsyncSession, question_ids: List[int]):
+    # id 목록을 하나의 배열 파라미터로 전달하여 목록의 길이 / 값과 상관없이 같은 SQL 사용 (prepared statement 재사용)
+    ids = bindparam('question_ids', question_ids, type_=ARRAY(BigInteger))
     stmt = (
         select(
-            Selection.id,
-            Selection.name,
-            Selection.is_correct
-        )
-        .where(Selection.id.in_(selection_ids))
-        .order_by(
-            case(
-                {
-                    id_value: index for index, id_value in enumerate(selection_ids)
-                },
-                value=Selection.id,
-                else_=len(selection_ids)
-            )
+            Question.id,
+            Question.name
         )
+        .where(Question.id == any_(ids))
+        # 전달한 id 순서대로 정렬
+        .order_by(func.array_position(ids, Question.id))
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(stmt)
-        return result.fetchall()
+    result = await db.execute(stmt)
+    return result.fetchall() if len(question_ids) != 0 else []
+
+
+async def next_pre_save_revision(db: AsyncSession) -> int:
+    # 버퍼에 보관할 임시 저장 답안을 받은 순서 발급 (sequence 는 replica 에서 발급할 수 없으므로 primary 사용)
+    stmt = select(pre_save_revision_seq.next_value()).execution_options(use_primary=True)
+
+    result = await db.execute(stmt)
+    return result.scalar()
+
+
+async def update_pre_save_data(
+        db: AsyncSession, pre_save_answers: List[Tuple[int, int, str, Optional[int]]], merge: bool = False
+):
+    # (user_idx, quiz_id, answer, revision) 목록을 한 번의 UPDATE ... FROM unnest 로 저장 + 응시 상태 (2) 기록
+    # merge 인 경우 기존 답안에 변경된 문제의 답안만 jsonb 로 병합 (answer = 기존 답안 || 변경 답안)
+    # revision : 버퍼에 보관했던 답안을 받은 순서 (next_pre_save_revision), 바로 저장하는 경우 None (저장 시 발급)
+    # 버퍼에 보관했던 전체 답안은 더 나중에 받은 답안이 이미 저장된 경우 (다른 워커 / 최종 제출 전 저장) 덮어쓰지 않음
+    # (변경된 문제의 답안은 서로 다른 문제일 수 있으므로 순서와 관계없이 병합)
+    payload = func.unnest(
+        bindparam('user_ids', [user_idx for user_idx, _, _, _ in pre_save_answers], type_=ARRAY(BigInteger)),
+        bindparam('quiz_ids', [quiz_id for _, quiz_id, _, _ in pre_save_answers], type_=ARRAY(BigInteger)),
+        bindparam('answers', [answer for _, _, answer, _ in pre_save_answers], type_=ARRAY(TEXT)),
+        bindparam('revisions', [revision for _, _, _, revision in pre_save_answers], type_=ARRAY(BigInteger))
+    ).table_valued('user_id', 'quiz_id', 'answer', 'revision').render_derived(with_types=False)
+
+    answer = cast(payload.c.answer, JSONB)
+    if merge:
+        answer = func.coalesce(PreSave.answer, cast(literal_column("'{}'"), JSONB)).op('||')(answer)
+
+    conditions = [PreSave.user_id == payload.c.user_id, PreSave.quiz_id == payload.c.quiz_id]
+    if not merge:
+        conditions.append(or_(
+            payload.c.revision.is_(None),
+            PreSave.revision.is_(None),
+            PreSave.revision < payload.c.revision
+        ))
 
+    updated = (
+        update(PreSave)
+        .where(*conditions)
+        .values(
+            answer=answer,
+            revision=func.greatest(PreSave.revision, func.coalesce(payload.c.revision, pre_save_revision_seq.next_value()))
+        )
+        .returning(PreSave.user_id, PreSave.quiz_id)
+        .cte('updated')
+    )
 
-async def is_exist_submit_log(quiz_id: int, user_idx: int):
     stmt = (
-        select(func.count(QuestionLog.id))
-        .select_from(QuestionLog)
-        .join(Question, QuestionLog.question_id == Question.id)
-        .where(
-            QuestionLog.user_id == user_idx,
-            Question.quiz_id == quiz_id
+        pg_insert(UserQuizStatus)
+        .from_select(
+            ['user_id', 'quiz_id', 'status', 'correct_count'],
+            select(updated.c.user_id, updated.c.quiz_id, literal_column('2'), literal_column('0'))
         )
+        .on_conflict_do_nothing(index_elements=[UserQuizStatus.user_id, UserQuizStatus.quiz_id])
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(stmt)
-        return True if result.scalar() != 0 else False
+    await db.execute(stmt)
+    await db.commit()
 
 
-async def update_pre_save_data(quiz_id: int, user_idx: int, answer: str):
+async def get_user_quiz_status(db: AsyncSession, quiz_id: int, user_idx: int):
     stmt = (
-        update(PreSave)
+        select(UserQuizStatus.status)
         .where(
-            PreSave.quiz_id == quiz_id,
-            PreSave.user_id == user_idx
+            UserQuizStatus.user_id == user_idx,
+            UserQuizStatus.quiz_id == quiz_id
         )
-        .values(answer=answer)
     )
 
-    async with database.session_factory() as db:
-        await db.execute(stmt)
-        await db.commit()
+    result = await db.execute(stmt)
+    return result.scalar()
 
 
-async def get_final_answer_by_user_id_and_quiz_id(user_idx: int, quiz_id: int):
+async def get_final_answer_by_user_id_and_quiz_id(db: AsyncSession, user_idx: int, quiz_id: int):
     stmt = (
         select(
             QuestionLog.question_id,
@@ -405,43 +548,238 @@ async def get_final_answer_by_user_id_and_quiz_id(user_idx: int, quiz_id: int):
         )
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(stmt)
-        answer_info = result.fetchall()
-        return answer_info if len(answer_info) != 0 else None
+    result = await db.execute(stmt)
+    answer_info = result.fetchall()
+    return answer_info if len(answer_info) != 0 else None
 
 
-async def quiz_select_count_by_id(quiz_id: int):
+async def get_answer_key_by_quiz_id(db: AsyncSession, quiz_id: int):
+    # 퀴즈의 출제 문제 수 + 문제 별 정답 보기 PK (question_id : frozenset(selection_id, ...))
     stmt = (
-        select(Quiz.s_count)
+        select(Quiz.s_count, Selection.question_id, Selection.id)
+        .select_from(Quiz)
+        .outerjoin(Question, Question.quiz_id == Quiz.id)
+        .outerjoin(
+            Selection,
+            and_(
+                Selection.question_id == Question.id,
+                Selection.is_correct == True
+            )
+        )
         .where(Quiz.id == quiz_id)
     )
 
-    async with database.session_factory() as db:
-        result = await db.execute(stmt)
-        return result.scalar()
-
+    result = await db.execute(stmt)
+    rows = result.fetchall()
+    if len(rows) == 0:
+        return None
+
+    answers = {}
+    for _, question_id, selection_id in rows:
+        if selection_id is not None:
+            answers.setdefault(question_id, set()).add(selection_id)
+    return rows[0].s_count, {question_id: frozenset(selection_ids) for question_id, selection_ids in answers.items()}
+
+
+async def final_submit_user_answer(
+        db: AsyncSession, quiz_id: int, user_idx: int, question_logs: List[Tuple[int, List[int], bool]]
+):
+    '''
+    @ 한 사용자의 최종 제출 저장
+
+    :param question_logs: (question_id, 정렬된 답안, 정답 여부) 목록
+
+    :return: bool (False : 이미 최종 제출한 이력이 있는 경우)
+    '''
+    submitted = await save_final_submissions(db, [(user_idx, quiz_id, question_logs)])
+    return (user_idx, quiz_id) in submitted
+
+
+async def save_final_submissions(db: AsyncSession, submissions: List[Tuple[int, int, List[Tuple[int, List[int], bool]]]]):
+    '''
+    @ 최종 제출 상태 기록 + 문제 별 답안 저장을 한 번의 쿼리로 처리 (여러 사용자의 제출을 한 번에 저장 가능)
+    - user_quiz_status (user_id, quiz_id) 를 제출 기록으로 사용하여 이미 최종 제출한 경우 (status 1) 갱신하지 않음
+    - 상태가 갱신된 제출의 답안만 저장하므로 동시에 제출해도 한 번만 저장
+    - 같은 (user_idx, quiz_id) 제출이 submissions 에 중복으로 있으면 안 됨 (ON CONFLICT 가 같은 행을 두 번 갱신할 수 없음)
+
+    :param submissions: (user_idx, quiz_id, question_logs) 목록
+        question_logs : (question_id, 정렬된 답안, 정답 여부) 목록
+
+    :return: set((user_idx, quiz_id)) - 저장된 제출
+    '''
+
+    # 최종 제출 상태 (1) + 맞힌 문제 수 기록
+    headers = func.unnest(
+        bindparam('user_ids', [user_idx for user_idx, _, _ in submissions], type_=ARRAY(BigInteger)),
+        bindparam('quiz_ids', [quiz_id for _, quiz_id, _ in submissions], type_=ARRAY(BigInteger)),
+        bindparam(
+            'correct_counts',
+            [sum(1 for _, _, is_correct in question_logs if is_correct) for _, _, question_logs in submissions],
+            type_=ARRAY(Integer)
+        )
+    ).table_valued('user_id', 'quiz_id', 'correct_count').render_derived(with_types=False)
 
-async def final_submit_user_answer(user_idx: int, requests: List[QuizSubmitRequest]):
-    async with database.session_factory() as db:
-        for request in requests:
-            question_id, answer = request.question_id, sorted(request.selection_ids)
+    header = pg_insert(UserQuizStatus).from_select(
+        ['user_id', 'quiz_id', 'status', 'correct_count'],
+        select(headers.c.user_id, headers.c.quiz_id, literal_column('1'), headers.c.correct_count)
+    )
+    submitted = (
+        header.on_conflict_do_update(
+            index_elements=[UserQuizStatus.user_id, UserQuizStatus.quiz_id],
+            set_={
+                'status': header.excluded.status,
+                'correct_count': header.excluded.correct_count
+            },
+            where=UserQuizStatus.status != 1
+        )
+        .returning(UserQuizStatus.user_id, UserQuizStatus.quiz_id)
+        .cte('submitted')
+    )
 
-            result = await db.execute(
-                select(Selection.id)
-                .where(
-                    Selection.question_id == question_id,
-                    Selection.is_correct == True
+    question_logs = [
+        # 2차원 배열은 행 단위로 unnest 할 수 없으므로 답안은 배열 리터럴 ('{1,2}') 로 전달 후 BIGINT[] 로 변환
+        (user_idx, quiz_id, question_id, '{' + ','.join(str(int(selection_id)) for selection_id in answer) + '}', is_correct)
+        for user_idx, quiz_id, logs in submissions
+        for question_id, answer, is_correct in logs
+    ]
+    payload = func.unnest(
+        bindparam('log_user_ids', [log[0] for log in question_logs], type_=ARRAY(BigInteger)),
+        bindparam('log_quiz_ids', [log[1] for log in question_logs], type_=ARRAY(BigInteger)),
+        bindparam('question_ids', [log[2] for log in question_logs], type_=ARRAY(BigInteger)),
+        bindparam('user_answers', [log[3] for log in question_logs], type_=ARRAY(TEXT)),
+        bindparam('is_corrects', [log[4] for log in question_logs], type_=ARRAY(BOOLEAN))
+    ).table_valued('user_id', 'quiz_id', 'question_id', 'user_answer', 'is_correct').render_derived(with_types=False)
+
+    logged = (
+        insert(QuestionLog)
+        .from_select(
+            ['user_id', 'question_id', 'user_answer', 'is_correct'],
+            select(
+                payload.c.user_id,
+                payload.c.question_id,
+                cast(payload.c.user_answer, ARRAY(BigInteger)),
+                payload.c.is_correct
+            )
+            .select_from(payload)
+            .join(
+                submitted,
+                and_(
+                    submitted.c.user_id == payload.c.user_id,
+                    submitted.c.quiz_id == payload.c.quiz_id
                 )
-                .order_by(Selection.id)
             )
-            real_answer = result.scalars().all()
-
-            db.add(QuestionLog(
-                user_id=user_idx,
-                question_id=question_id,
-                user_answer=json.dumps(answer),
-                is_correct=True if answer == real_answer else False
-            ))
+        )
+        .cte('logged')
+    )
 
-        await db.commit()
\ No newline at end of file
+    result = await db.execute(
+        select(submitted.c.user_id, submitted.c.quiz_id)
+        .add_cte(logged)
+    )
+    submitted_keys = {(user_idx, quiz_id) for user_idx, quiz_id in result.fetchall()}
+    await invalidation_bus.publish(db, [
+        InvalidationEvent(type=InvalidationType.QUIZ_SUBMITTED, quiz_id=quiz_id, user_id=user_idx)
+        for user_idx, quiz_id in submitted_keys
+    ])
+    await db.commit()
+    return submitted_keys
+
+
+class GroupCommitWriter:
+    '''
+    @ 최종 제출 group commit writer
+    - 동시에 들어온 최종 제출을 window_ms 동안 모아 한 번의 쿼리 + 한 번의 commit 으로 저장 후 각 요청에 결과 전달
+    - 모인 제출이 max_batch_size 개가 되면 기다리지 않고 바로 저장
+    - window_ms 가 0 이하인 경우 모으지 않고 요청 세션으로 바로 저장
+
+    :param window_ms: 제출을 모으는 최대 시간 (ms)
+    :param max_batch_size: 한 번에 저장할 최대 제출 수
+    '''
+
+    def __init__(self, window_ms: float, max_batch_size: int):
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        # (user_idx, quiz_id, question_logs, 결과를 전달할 future)
+        self._pending: List[Tuple[int, int, list, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flushing = set()
+
+    @property
+    def enabled(self):
+        return self.window > 0
+
+    async def submit(self, db: AsyncSession, quiz_id: int, user_idx: int, question_logs: List[Tuple[int, List[int], bool]]):
+        '''
+        :return: bool (False : 이미 최종 제출한 이력이 있는 경우)
+        '''
+        if not self.enabled:
+            return await final_submit_user_answer(db, quiz_id, user_idx, question_logs)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((user_idx, quiz_id, question_logs, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_window())
+
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self.flush()
+
+    def _flush_now(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        task = asyncio.create_task(self.flush())
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def flush(self):
+        # 저장을 기다리는 사이 새로 들어온 제출도 max_batch_size 단위로 나누어 저장
+        while len(self._pending) != 0:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            await self._write(batch)
+
+    async def _write(self, batch: List[Tuple[int, int, list, asyncio.Future]]):
+        # 같은 배치에 같은 사용자의 같은 퀴즈 제출이 여러 번 있으면 먼저 들어온 제출만 저장
+        submissions = {}
+        for user_idx, quiz_id, question_logs, _ in batch:
+            submissions.setdefault((user_idx, quiz_id), question_logs)
+
+        try:
+            # 여러 요청의 제출을 함께 저장하므로 별도 세션 사용
+            async with database.session_factory() as db:
+                submitted = await save_final_submissions(
+                    db, [(user_idx, quiz_id, question_logs) for (user_idx, quiz_id), question_logs in submissions.items()]
+                )
+        except Exception as e:
+            print(f"Final submit group commit failed: {e}")
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        resolved = set()
+        for user_idx, quiz_id, _, future in batch:
+            is_submitted = (user_idx, quiz_id) in submitted and (user_idx, quiz_id) not in resolved
+            resolved.add((user_idx, quiz_id))
+            if not future.done():
+                future.set_result(is_submitted)
+
+    async def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        await self.flush()
+        if len(self._flushing) != 0:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+
+group_commit_writer = GroupCommitWriter(setting.SUBMIT_GROUP_COMMIT_WINDOW_MS, setting.SUBMIT_GROUP_COMMIT_MAX_BATCH)
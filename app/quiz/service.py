@@ -1,21 +1,41 @@
-import json
+import asyncio
 import random
-from itertools import permutations
+from math import perm
 from typing import List, Optional
 
-from app.config.model import User
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.database import database
+from app.config.invalidation import invalidation_bus, InvalidationType
+from app.config.setting import setting
 from app.quiz.dto.request import QuestionInfoRequest, QuizSubmitRequest
 from app.quiz import repository
-from app.quiz.dto.service import QuizInfo, QuestionInfoService, SelectionInfoService, UserAnswerInfo
+from app.quiz.pre_save_buffer import pre_save_buffer
+from app.quiz.dto.service import QuizInfo, QuestionInfoService, SelectionInfoService, UserAnswerInfo, QuizContent, AnswerKey
+from app.util.auth_handler import AuthUser
+from app.util.cache import LRUCache, TTLCache, SingleFlight
 from app.util.pagination import pagination
 
+# 퀴즈 버전 별 문제 + 보기 구성 캐시 (key : (quiz_id, version))
+content_cache = LRUCache(setting.QUIZ_CONTENT_CACHE_SIZE)
+# 퀴즈 별 정답표 캐시 (key : quiz_id)
+answer_key_cache = LRUCache(setting.ANSWER_KEY_CACHE_SIZE)
+# 전체 퀴즈 수 캐시
+quiz_count_cache = TTLCache(1, setting.QUIZ_COUNT_CACHE_TTL)
+# 캐시 miss 시 같은 퀴즈 버전의 문제 구성 조회를 하나로 합침
+content_loads = SingleFlight()
+
 
-async def save_new_quiz(name: str, select_count: int, pagination_count: int, is_random: bool, questions: List[QuestionInfoRequest]):
+async def save_new_quiz(
+        db: AsyncSession, name: str, select_count: int, pagination_count: int, is_random: bool, version_count: int,
+        questions: List[QuestionInfoRequest]
+):
     '''
     :param name: 퀴즈 이름
     :param select_count: 출제할 문제 수
     :param pagination_count: 한 목록에 보여질 문제의 수 (페이지 네이션)
     :param is_random: 퀴즈 출제 시 랜덤 여부
+    :param version_count: 랜덤 출제 시 생성할 버전 수
     :param questions: 퀴즈의 문제 데이터
 
     :return: int
@@ -24,60 +44,93 @@ async def save_new_quiz(name: str, select_count: int, pagination_count: int, is_
             -2 : 설정한 출제 문제 수가 총 문제 수보다 작은 경우
             -3 : 특정 문제에 보기가 2개 미만인 경우
             -4 : 특정 문제에 정답이 한 개라도 존재하지 않은 경우
+            -5 : 버전 수가 1 ~ QUIZ_MAX_VERSION_COUNT 범위를 벗어난 경우
+    '''
+    quiz_id = await repository.save_new_quiz(db, name, select_count, pagination_count, is_random, version_count, questions)
+
+    if quiz_id > 0:
+        quiz_count_cache.invalidate()
+    return quiz_id
+
+
+async def get_all_quiz_by_auth(db: AsyncSession, limit: int, page: int, after: Optional[int], user: AuthUser):
     '''
-    return await repository.save_new_quiz(name, select_count, pagination_count, is_random, questions)
+    :param limit: 목록에 보여질 퀴즈의 수
+    :param page: 현재 페이지 (after 가 없는 경우 offset 계산에 사용)
+    :param after: 이전 목록의 마지막 퀴즈 PK (cursor, 있는 경우 page 대신 사용)
+    :param user: 인증된 사용자
 
+    :return: (Page, List[QuizInfo], 다음 목록 조회 시 사용할 cursor - 마지막 목록인 경우 None)
+    '''
 
-async def get_all_quiz_by_auth(limit: int, page: int, user: User):
-    total_quiz_count, quiz_info = await repository.get_all_quiz_by_auth_and_limit(
-        limit, page, user.id, user.is_admin
-    )
+    quiz_info = await repository.get_all_quiz_by_auth_and_limit(db, limit, page, after, user.id, user.is_admin)
 
     quizzes = [QuizInfo.model_validate(quiz) for quiz in quiz_info]
-    page_info = pagination.get_page_data(total_quiz_count, limit, page)
+    page_info = pagination.get_page_data(await get_quiz_count(db), limit, page)
+    next_after = quizzes[-1].id if len(quizzes) == limit else None
+
+    return page_info, quizzes, next_after
+
+
+async def get_quiz_count(db: AsyncSession):
+    '''
+    @ 전체 퀴즈 수 (목록 조회마다 count 하지 않도록 캐싱, 퀴즈 생성 시 무효화)
+    '''
 
-    return page_info, quizzes
+    total_quiz_count = quiz_count_cache.get('total')
+    if total_quiz_count is None:
+        total_quiz_count = await repository.get_quiz_count(db)
+        quiz_count_cache.set('total', total_quiz_count)
+    return total_quiz_count
 
 
-async def get_quiz_detail(quiz_id: int, user: User, page: int):
-    quiz_name, total_question_count, question_count, pagination_count, is_random, status, correct_question_count = \
-        await repository.get_quiz_info_by_id_and_user(quiz_id, user.id, user.is_admin)
+async def get_quiz_detail(db: AsyncSession, quiz_id: int, user: AuthUser, page: int):
+    '''
+    @ 서로 의존하지 않는 조회는 단계 별로 묶어 동시에 실행 (database.gather)
+    - 사용자 : 1) 퀴즈 정보 / 버전 + 임시 저장 답안 / 최종 제출 답안 -> 2) 첫 진입인 경우 버전 지급 -> 3) 버전 별 문제 구성
+    - 관리자 : 1) 퀴즈 정보 -> 2) 페이지에 포함된 문제 + 보기 (SQL 에서 페이지 단위로 조회)
+
+    :return: 퀴즈 상세 정보 혹은 -1 (사용자인 경우 퀴즈 버전이 아직 생성되지 않은 경우)
+    '''
 
     # 관리자가 아닌 경우
     if not user.is_admin:
-        questions = []
+        quiz_info, pre_save, final_answer = await database.gather(
+            db,
+            lambda session: repository.get_quiz_info_by_id_and_user(session, quiz_id, user.id, user.is_admin),
+            lambda session: repository.get_quiz_version_by_quiz_id_and_user_id(session, quiz_id, user.id),
+            lambda session: repository.get_final_answer_by_user_id_and_quiz_id(session, user.id, quiz_id)
+        )
+        (
+            quiz_name, total_question_count, question_count, pagination_count,
+            is_random, is_ready, status, correct_question_count
+        ) = quiz_info
 
-        # 랜덤 출제 + 사용자가 한번도 해당 퀴즈에 진입한 적이 없는 경우
-        if await repository.not_exist_pre_save_by_quiz_and_user_idx(quiz_id, user.id):
-            version_num = 1
+        # 퀴즈 버전이 아직 생성되지 않은 경우
+        if not is_ready:
+            return -1
 
-            if is_random:
-                max_version = await repository.get_max_quiz_version_by_quiz_id(quiz_id)
-                version_num = random.randint(1, max_version)
+        # 사용자가 한번도 해당 퀴즈에 진입한 적이 없는 경우 버전 지급 (랜덤 출제인 경우 랜덤 버전)
+        if pre_save is None:
+            pre_save = await repository.enter_quiz(db, quiz_id, user.id, is_random)
 
-            # 랜덤 출제한 퀴즈 임시 저장
-            await repository.update_quiz_version_by_user(user.id, quiz_id, version_num)
+            # 동시에 들어온 다른 요청이 먼저 진입한 경우 해당 요청이 지급 받은 버전 사용
+            if pre_save is None:
+                pre_save = await repository.get_quiz_version_by_quiz_id_and_user_id(db, quiz_id, user.id)
 
-        question_ids, selection_info, pre_save_answer = await repository.get_quiz_version_by_quiz_id_and_user_id(quiz_id, user.id)
-        question_ids, selection_info = json.loads(question_ids), json.loads(selection_info)
+        version_num, pre_save_answer = pre_save
 
-        page_info = pagination.get_page_data(len(question_ids), pagination_count, page)
-        question_info = await repository.get_question_info_by_ids(
-            question_ids[(page-1)*pagination_count : page*pagination_count]
-        )
+        # 아직 DB 에 저장되지 않은 임시 저장 답안 반영
+        pre_save_answer = pre_save_buffer.apply(user.id, quiz_id, pre_save_answer)
+        content = await get_quiz_content(quiz_id, version_num)
 
-        for question_id, question_name in question_info:
-            selection_ids = selection_info[str(question_id)]
-            questions.append(QuestionInfoService(
-                id=question_id,
-                name=question_name,
-                selections=[
-                    SelectionInfoService.model_validate(selection) for selection in
-                    await repository.get_selection_info_by_ids(selection_ids)
-                ]
-            ))
+        page_info = pagination.get_page_data(len(content.question_ids), pagination_count, page)
+        questions = [
+            content.questions[question_id]
+            for question_id in content.question_ids[(page-1)*pagination_count : page*pagination_count]
+        ]
 
-        user_answers = await get_user_answer(pre_save_answer, quiz_id, user.id)
+        user_answers = get_user_answer(pre_save_answer, final_answer)
         return (
             quiz_name, total_question_count, question_count, pagination_count,
             is_random, status, correct_question_count, page_info, user_answers, questions
@@ -86,19 +139,24 @@ async def get_quiz_detail(quiz_id: int, user: User, page: int):
     # 관리자인 경우
     # 관리자는 랜덤 출제 + 출제 문항 수 상관 없이 모든 문제의 정보를 볼 수 있게 설정
     else:
-        questions = await repository.get_quiz_info_by_id(quiz_id)
-        page_info = pagination.get_page_data(len(questions), pagination_count, page)
-        question_info = []
+        (
+            quiz_name, total_question_count, question_count, pagination_count,
+            is_random, is_ready, status, correct_question_count
+        ) = await repository.get_quiz_info_by_id_and_user(db, quiz_id, user.id, user.is_admin)
+
+        # 전체 문제 수는 퀴즈의 q_count 를 사용하고 문제는 현재 페이지만 조회
+        page_info = pagination.get_page_data(total_question_count, pagination_count, page)
+        page_questions = await repository.get_question_page_by_quiz_id(
+            db, quiz_id, pagination_count, max(page-1, 0)*pagination_count
+        )
 
-        for question_id, question_name in questions[(page-1)*pagination_count:page*pagination_count]:
-            question_info.append(QuestionInfoService(
+        question_info = [
+            QuestionInfoService(
                 id=question_id,
                 name=question_name,
-                selections=[
-                    SelectionInfoService.model_validate(selection) for selection in
-                    await repository.get_selections_by_question_id_and_is_random(question_id)
-                ]
-            ))
+                selections=[SelectionInfoService.model_validate(selection) for selection in selections]
+            ) for question_id, question_name, selections in page_questions
+        ]
         return (
             quiz_name, total_question_count, question_count,
             pagination_count, is_random, status,
@@ -106,50 +164,142 @@ async def get_quiz_detail(quiz_id: int, user: User, page: int):
         )
 
 
-async def quiz_version_update(quiz_id: int):
+async def get_quiz_content(quiz_id: int, version_num: int):
     '''
-    @ 퀴즈가 새로 생성 시 가능한 버전을 미리 세팅하는 함수
-    - 랜덤인 경우 : 최대 10개의 버전을 만들어 사용자에게 랜덤으로 지급
-    - 랜덤이 아닌 경우 : 차례대로 문항을 배분
+    @ 퀴즈 버전 별 문제 + 보기 구성을 return
+    - 문제 / 보기 / 버전 정보는 생성 이후 변경되지 않으므로 (quiz_id, version) 단위로 캐싱
+    - 캐시 miss 가 동시에 발생한 경우 (시험 시작 직후 등) 한 번만 조회하고 결과를 함께 사용
 
     :param quiz_id: 퀴즈 PK
+    :param version_num: 퀴즈 버전
+
+    :return: QuizContent
     '''
 
-    is_random, s_count, question_ids = await repository.get_quiz_is_random_and_question_ids_by_quiz_id(quiz_id)
+    content = content_cache.get((quiz_id, version_num))
+    if content is not None:
+        return content
 
-    if is_random:
-        perm = list(permutations(question_ids, s_count))
-        random.shuffle(perm)
-        version_num = 1
+    return await content_loads.do((quiz_id, version_num), lambda: load_quiz_content(quiz_id, version_num))
+
+
+async def load_quiz_content(quiz_id: int, version_num: int):
+    # 여러 요청이 함께 기다리는 조회이므로 요청 세션이 아닌 별도 세션 사용
+    async with database.session_factory() as db:
+        question_ids, selection_ids, selection_counts = \
+            await repository.get_quiz_version_content(db, quiz_id, version_num)
 
-        for ramdom_question_ids in perm[:10]:
-            question_info, selection_info = [], {}
-            for question_id in ramdom_question_ids:
-                selection_ids = await repository.get_selection_ids_by_question_id(question_id)
-                random.shuffle(selection_ids)
-                question_info.append(question_id)
-                selection_info[question_id] = selection_ids
+        question_info, selections = await database.gather(
+            db,
+            lambda session: repository.get_question_info_by_ids(session, question_ids),
+            lambda session: repository.get_selections_by_question_ids(session, question_ids)
+        )
+
+    # 이어 붙여 저장된 보기 순서를 문제 별 보기 수만큼 나누어 문제 별 보기 순서로 복원
+    selection_info, start = {}, 0
+    for question_id, selection_count in zip(question_ids, selection_counts):
+        selection_info[question_id] = selection_ids[start:start + selection_count]
+        start += selection_count
+
+    questions = {}
+    for question_id, question_name in question_info:
+        # 버전에 저장된 보기 순서대로 재배치
+        selection_by_id = {selection.id: selection for selection in selections.get(question_id, [])}
+        questions[question_id] = QuestionInfoService(
+            id=question_id,
+            name=question_name,
+            selections=[
+                SelectionInfoService.model_validate(selection_by_id[selection_id])
+                for selection_id in selection_info[question_id]
+            ]
+        )
 
-            await repository.add_quiz_version(quiz_id, version_num, question_info, selection_info)
-            version_num += 1
+    content = QuizContent(question_ids=question_ids, questions=questions)
+    content_cache.set((quiz_id, version_num), content)
+    return content
+
+
+def invalidate_quiz_content(quiz_id: Optional[int]):
+    '''
+    @ 해당 퀴즈의 모든 버전 캐시 + 정답표 캐시를 제거 (퀴즈 버전이 새로 생성되거나 퀴즈가 변경된 경우 호출)
+
+    :param quiz_id: 퀴즈 PK (None 인 경우 모든 퀴즈)
+    '''
+    if quiz_id is None:
+        content_cache.invalidate()
+        answer_key_cache.invalidate()
+        return
+
+    content_cache.invalidate(lambda key: key[0] == quiz_id)
+    answer_key_cache.invalidate(lambda key: key == quiz_id)
+
+
+# 다른 워커 (혹은 별도 프로세스의 버전 생성 워커) 에서 발생한 변경도 반영
+invalidation_bus.subscribe(InvalidationType.QUIZ_CREATED, lambda event: quiz_count_cache.invalidate())
+invalidation_bus.subscribe(InvalidationType.QUIZ_VERSIONS_READY, lambda event: invalidate_quiz_content(event.quiz_id))
+
+
+async def generate_quiz_versions(db: AsyncSession, quiz_id: int):
+    '''
+    @ 퀴즈가 새로 생성 시 가능한 버전을 미리 세팅하는 함수 (버전 생성 워커에서 호출, commit 은 워커에서 작업 완료 처리와 함께)
+    - 랜덤인 경우 : 퀴즈에 설정된 버전 수(v_count)만큼 버전을 만들어 사용자에게 랜덤으로 지급
+    - 랜덤이 아닌 경우 : 차례대로 문항을 배분
+
+    :param quiz_id: 퀴즈 PK
+    '''
+    is_random, s_count, v_count, question_ids = \
+        await repository.get_quiz_is_random_and_question_ids_by_quiz_id(db, quiz_id)
+    selection_ids = await repository.get_selection_ids_by_quiz_id(db, quiz_id)
+
+    if is_random:
+        # 버전 샘플링은 CPU 작업이므로 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+        versions = await asyncio.to_thread(
+            lambda: list(generate_random_versions(question_ids, selection_ids, s_count, v_count))
+        )
 
     else:
-        question_info, selection_info = [], {}
-        for question_id in question_ids[:s_count]:
-            selection_ids = await repository.get_selection_ids_by_question_id(question_id)
-            question_info.append(question_id)
-            selection_info[question_id] = selection_ids
+        question_info = question_ids[:s_count]
+        versions = [(question_info, {question_id: selection_ids[question_id] for question_id in question_info})]
+
+    await repository.add_quiz_versions(db, quiz_id, versions)
+
 
-        await repository.add_quiz_version(quiz_id, 1, question_info, selection_info)
+def generate_random_versions(question_ids: List[int], selection_ids: dict, s_count: int, version_count: int):
+    '''
+    @ 모든 순열을 만들지 않고 서로 다른 문제 순서를 version_count 개만큼 바로 샘플링하는 generator
 
+    :param question_ids: 퀴즈의 전체 문제 PK
+    :param selection_ids: 문제 별 보기 PK (question_id : [selection_id, ...])
+    :param s_count: 출제할 문제 수
+    :param version_count: 생성할 버전 수 (가능한 순열의 수보다 크면 순열의 수로 제한)
 
-async def get_user_answer(pre_save_answer: Optional[str], quiz_id: int, user_idx: int):
+    :return: (문제 순서, 문제 별 보기 순서) 를 버전 수만큼 yield
+    '''
+
+    version_count = min(max(version_count, 1), perm(len(question_ids), s_count))
+    used_orders = set()
+
+    while len(used_orders) < version_count:
+        question_info = random.sample(question_ids, s_count)
+        if tuple(question_info) in used_orders:
+            continue
+        used_orders.add(tuple(question_info))
+
+        selection_info = {}
+        for question_id in question_info:
+            shuffled_selection_ids = list(selection_ids[question_id])
+            random.shuffle(shuffled_selection_ids)
+            selection_info[question_id] = shuffled_selection_ids
+
+        yield question_info, selection_info
+
+
+def get_user_answer(pre_save_answer: Optional[dict], final_answer: Optional[list]):
     '''
     @ 해당 문제에 대해 유저가 선택한 답안을 return
 
-    :param pre_save_answer: 임시 저장된 퀴즈의 정답 데이터 (json 형태의 String 혹은 None)
-    :param quiz_id: 퀴즈 PK
-    :param user_idx: 사용자 PK
+    :param pre_save_answer: 임시 저장된 퀴즈의 정답 데이터 (question_id : [selection_id, ...] 혹은 None)
+    :param final_answer: 최종 제출한 문제 별 답안 (question_id, user_answer) 목록 (제출 이력이 없는 경우 None)
 
     :return: None 혹은 List[UserAnswerInfo]
     '''
@@ -158,11 +308,8 @@ async def get_user_answer(pre_save_answer: Optional[str], quiz_id: int, user_idx
     if pre_save_answer is None:
         return None
 
-    pre_save_answer = json.loads(pre_save_answer)
     user_answers = []
 
-    final_answer = await repository.get_final_answer_by_user_id_and_quiz_id(user_idx, quiz_id)
-
     if final_answer is None:
         for question_id in pre_save_answer.keys():
             user_answers.append(UserAnswerInfo(
@@ -174,13 +321,13 @@ async def get_user_answer(pre_save_answer: Optional[str], quiz_id: int, user_idx
         for question_id, user_answer in final_answer:
             user_answers.append(UserAnswerInfo(
                 question_id=question_id,
-                selection_ids=json.loads(user_answer)
+                selection_ids=user_answer
             ))
 
     return user_answers
 
 
-async def update_pre_save_data(quiz_id: int, user_idx: int, request: List[QuizSubmitRequest]):
+async def update_pre_save_data(db: AsyncSession, quiz_id: int, user_idx: int, request: List[QuizSubmitRequest]):
     '''
 
     :param quiz_id: 퀴즈 PK
@@ -193,38 +340,99 @@ async def update_pre_save_data(quiz_id: int, user_idx: int, request: List[QuizSu
 
     '''
 
-    if await repository.is_exist_submit_log(quiz_id, user_idx):
+    if await repository.get_user_quiz_status(db, quiz_id, user_idx) == 1:
         return -1
 
     pre_save_answer = {}
 
     for quiz_answer_info in request:
-        pre_save_answer[quiz_answer_info.question_id] = quiz_answer_info.selection_ids
+        pre_save_answer[str(quiz_answer_info.question_id)] = quiz_answer_info.selection_ids
 
-    await repository.update_pre_save_data(quiz_id, user_idx, json.dumps(pre_save_answer))
+    await pre_save_buffer.put(db, user_idx, quiz_id, pre_save_answer)
     return True
 
 
-async def final_submit_quiz_answer(quiz_id: int, user_idx: int, request: List[QuizSubmitRequest]):
+async def merge_pre_save_data(db: AsyncSession, quiz_id: int, user_idx: int, request: List[QuizSubmitRequest]):
     '''
+    @ 변경된 문제의 답안만 기존 임시 저장 답안에 병합
 
     :param quiz_id: 퀴즈 PK
     :param user_idx: 유저 PK
-    :param request: 문제 별 답안 내용
+    :param request: 변경된 문제 별 답안 내용
 
     :return: int or bool
         -1 : 최종 제출한 이력이 있는 경우
-        -2 : 출제 문제 수와 제출한 문제 수가 맞지 않는 경우
-        True : 최종 제출 성공
+        True : 임시 저장 성공
 
     '''
 
-    if await repository.is_exist_submit_log(quiz_id, user_idx):
+    if await repository.get_user_quiz_status(db, quiz_id, user_idx) == 1:
         return -1
 
-    total_question_count = await repository.quiz_select_count_by_id(quiz_id)
-    if len(request) != total_question_count:
+    changed_answer = {
+        str(quiz_answer_info.question_id): quiz_answer_info.selection_ids for quiz_answer_info in request
+    }
+
+    await pre_save_buffer.merge(db, user_idx, quiz_id, changed_answer)
+    return True
+
+
+async def final_submit_quiz_answer(db: AsyncSession, quiz_id: int, user_idx: int, request: List[QuizSubmitRequest]):
+    '''
+    @ 캐싱된 정답표로 검증 + 채점 후 한 번의 쿼리로 최종 제출
+
+    :param quiz_id: 퀴즈 PK
+    :param user_idx: 유저 PK
+    :param request: 문제 별 답안 내용
+
+    :return: int or bool
+        -1 : 최종 제출한 이력이 있는 경우 (동시에 제출한 경우 먼저 저장된 제출만 반영)
+        -2 : 출제 문제 수와 제출한 문제 수가 맞지 않는 경우 (최종 제출한 이력이 없는 경우)
+        True : 최종 제출 성공
+
+    '''
+
+    answer_key = await get_answer_key(db, quiz_id)
+    if answer_key is None or len(request) != answer_key.select_count:
+        # 이미 최종 제출한 경우 제출한 문제 수와 관계없이 중복 제출로 응답
+        if await repository.get_user_quiz_status(db, quiz_id, user_idx) == 1:
+            return -1
         return -2
 
-    await repository.final_submit_user_answer(user_idx, request)
-    return True
\ No newline at end of file
+    # 버퍼에 남아 있는 해당 사용자의 임시 저장 답안을 먼저 저장
+    await pre_save_buffer.flush_user(db, user_idx, quiz_id)
+
+    # 미리 계산된 정답표로 메모리에서 채점
+    question_logs = [
+        (
+            answer.question_id,
+            sorted(answer.selection_ids),
+            frozenset(answer.selection_ids) == answer_key.answers.get(answer.question_id)
+        ) for answer in request
+    ]
+
+    # 동시에 들어온 다른 제출과 함께 저장 (group commit 이 꺼져 있으면 바로 저장)
+    if not await repository.group_commit_writer.submit(db, quiz_id, user_idx, question_logs):
+        return -1
+    return True
+
+
+async def get_answer_key(db: AsyncSession, quiz_id: int):
+    '''
+    @ 퀴즈의 출제 문제 수 + 정답표를 return (보기의 정답 여부는 변경되지 않으므로 퀴즈 단위로 캐싱)
+
+    :param quiz_id: 퀴즈 PK
+
+    :return: AnswerKey 혹은 None (퀴즈가 없는 경우)
+    '''
+
+    answer_key = answer_key_cache.get(quiz_id)
+    if answer_key is None:
+        key_info = await repository.get_answer_key_by_quiz_id(db, quiz_id)
+        if key_info is None:
+            return None
+
+        select_count, answers = key_info
+        answer_key = AnswerKey(select_count=select_count, answers=answers)
+        answer_key_cache.set(quiz_id, answer_key)
+    return answer_key
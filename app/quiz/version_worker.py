@@ -0,0 +1,119 @@
+import asyncio
+import sys
+from typing import Optional
+
+from app.config.database import database
+from app.config.setting import setting
+from app.quiz import repository, service
+
+
+class QuizVersionWorker:
+    '''
+    @ 퀴즈 버전 생성 작업 워커
+    - pro.quiz_version_job 의 작업을 FOR UPDATE SKIP LOCKED 로 하나씩 가져와 처리 (여러 워커 / 프로세스가 동시에 실행 가능)
+    - 버전 저장 + 퀴즈 준비 완료 + 작업 삭제를 한 트랜잭션으로 처리하므로 처리 중 종료되어도 작업이 유실되지 않음
+    - 실패한 작업은 시도 횟수를 기록하고 retry_delay 초 (실패할 때마다 2배) 뒤에 다시 처리
+      max_attempts 회 실패하면 실패 상태로 남김 (python -m app.quiz.version_worker --requeue-failed 로 다시 대기 상태로 변경)
+    - 대기 중인 작업이 없으면 poll_interval 초마다 확인 (같은 프로세스에서 퀴즈가 생성된 경우 wake 로 바로 처리)
+
+    :param poll_interval: 작업 확인 주기 (초)
+    :param max_attempts: 작업 별 최대 시도 횟수
+    :param retry_delay: 실패한 작업의 첫 재시도 대기 시간 (초)
+    '''
+
+    def __init__(self, poll_interval: float, max_attempts: int, retry_delay: float):
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._wake_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def wake(self):
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    async def process_next(self) -> bool:
+        '''
+        @ 대기 중인 작업 하나를 처리
+
+        :return: 처리한 작업이 있는 경우 True
+        '''
+        async with database.session_factory() as db:
+            job = await repository.claim_quiz_version_job(db)
+            if job is None:
+                await db.rollback()
+                return False
+
+            job_id, quiz_id = job
+            try:
+                # 실패 시 savepoint 까지만 rollback 하여 작업의 행 잠금을 유지한 채 실패 기록
+                async with db.begin_nested():
+                    await service.generate_quiz_versions(db, quiz_id)
+            except Exception as e:
+                print(f"Quiz version job failed (quiz_id={quiz_id}): {e}")
+                await repository.fail_quiz_version_job(db, job_id, str(e), self.max_attempts, self.retry_delay)
+                return True
+
+            await repository.complete_quiz_version_job(db, job_id, quiz_id)
+
+        service.invalidate_quiz_content(quiz_id)
+        return True
+
+    async def run(self):
+        self._wake_event = asyncio.Event()
+        while True:
+            self._wake_event.clear()
+            try:
+                # 대기 중인 작업이 없을 때까지 연속으로 처리
+                while await self.process_next():
+                    pass
+            except Exception as e:
+                print(f"Quiz version worker error: {e}")
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if setting.QUIZ_VERSION_WORKER_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wake_event = None
+
+
+quiz_version_worker = QuizVersionWorker(
+    setting.QUIZ_VERSION_WORKER_POLL_INTERVAL,
+    setting.QUIZ_VERSION_JOB_MAX_ATTEMPTS,
+    setting.QUIZ_VERSION_JOB_RETRY_DELAY
+)
+
+
+async def requeue_failed(quiz_ids: Optional[list]):
+    async with database.session_factory() as db:
+        count = await repository.requeue_failed_quiz_version_jobs(db, quiz_ids)
+    print(f"Requeued {count} failed quiz version job(s)")
+
+
+async def main(args: list):
+    # API 프로세스와 분리하여 실행 : python -m app.quiz.version_worker
+    # 실패한 작업 다시 처리 : python -m app.quiz.version_worker --requeue-failed [quiz_id ...]
+    try:
+        if args and args[0] == '--requeue-failed':
+            await requeue_failed([int(quiz_id) for quiz_id in args[1:]] or None)
+        else:
+            await quiz_version_worker.run()
+    finally:
+        await database.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(sys.argv[1:]))
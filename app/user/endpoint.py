@@ -1,5 +1,7 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.database import database
 from app.user.dto.request import SignUp, SignIn
 from app.user import service
 from app.util.auth_handler import auth
@@ -39,9 +41,10 @@ router = APIRouter(tags=['☑️ USER'])
     }
 )
 async def signup(
-        request: SignUp
+        request: SignUp,
+        db: AsyncSession = Depends(database.get_db)
 ):
-    if await service.user_sign_up(request.user_id, request.is_admin):
+    if await service.user_sign_up(db, request.user_id, request.is_admin):
         return res.post_success()
     return res.post_exception(status.HTTP_409_CONFLICT, '이미 사용 중인 아이디입니다.')
 
@@ -77,11 +80,12 @@ async def signup(
     }
 )
 async def signin(
-        request: SignIn
+        request: SignIn,
+        db: AsyncSession = Depends(database.get_db)
 ):
-    user = await service.get_user_by_user_id(request.user_id)
+    user = await service.get_user_by_user_id(db, request.user_id)
 
     if not user:  # 유저 존재 X
         return res.post_exception(status.HTTP_409_CONFLICT, '존재하지 않은 아이디입니다.')
 
-    return res.post_custom('token', f'Bearer {await auth.encode_token(user.id)}')
\ No newline at end of file
+    return res.post_custom('token', f'Bearer {await auth.encode_token(user.id, user.is_admin)}')
\ No newline at end of file
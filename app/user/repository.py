@@ -1,38 +1,34 @@
-from sqlalchemy import select, func
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.database import database
 from app.config.model import User
 
 
-async def user_sign_up(user_id, is_admin):
+async def user_sign_up(db: AsyncSession, user_id, is_admin):
+    # 아이디 중복 체크 + 저장을 한 번의 쿼리로 처리 (동시에 가입해도 unique 제약으로 한 명만 저장)
     user_stmt = (
-        select(func.count(User.id))
-        .where(User.user_id == user_id)
+        pg_insert(User)
+        .values(user_id=user_id, is_admin=is_admin)
+        .on_conflict_do_nothing(index_elements=[User.user_id])
+        .returning(User.id)
     )
 
-    async with database.session_factory() as db:
-        # 아이디 중복 체크
-        result = await db.execute(user_stmt)
-        if result.scalar() != 0:
-            return False
-
-        db.add(User(
-            user_id=user_id,
-            is_admin=is_admin
-        ))
-        await db.commit()
-        return True
+    result = await db.execute(user_stmt)
+    await db.commit()
+    return result.scalar() is not None
 
 
-async def get_user_by_user_id(user_id):
+async def get_user_by_user_id(db: AsyncSession, user_id):
+    # 회원 가입 직후 로그인할 수 있도록 primary 에서 조회
     user_stmt = (
         select(User)
         .where(User.user_id == user_id)
+        .execution_options(use_primary=True)
     )
 
-    async with database.session_factory() as db:
-        # 아이디 존재 여부 확인
-        result = await db.execute(user_stmt)  # 결과를 비동기적으로 기다림
-        user = result.scalar_one_or_none()  # 비동기적으로 첫 번째 결과를 확인
+    # 아이디 존재 여부 확인
+    result = await db.execute(user_stmt)  # 결과를 비동기적으로 기다림
+    user = result.scalar_one_or_none()  # 비동기적으로 첫 번째 결과를 확인
 
-        return False if user is None else user
\ No newline at end of file
+    return False if user is None else user
\ No newline at end of file
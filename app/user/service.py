@@ -1,8 +1,10 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.user import repository
 
-async def user_sign_up(user_id: str, is_admin: int):
-    return await repository.user_sign_up(user_id, is_admin)
+async def user_sign_up(db: AsyncSession, user_id: str, is_admin: int):
+    return await repository.user_sign_up(db, user_id, is_admin)
 
 
-async def get_user_by_user_id(user_id: str):
-    return await repository.get_user_by_user_id(user_id)
\ No newline at end of file
+async def get_user_by_user_id(db: AsyncSession, user_id: str):
+    return await repository.get_user_by_user_id(db, user_id)
\ No newline at end of file
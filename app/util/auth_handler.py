@@ -2,22 +2,38 @@ from datetime import datetime, timedelta
 import jwt
 from fastapi import HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import BaseModel
 from sqlalchemy import select
 
 from app.config.database import database
 from app.config.model import User
 from app.config.setting import setting
+from app.util.cache import TTLCache
 
 # JWT 인증 방식을 설정 (Swagger에서 Authorize 버튼 활성화됨)
 security = HTTPBearer()
 
+
+class AuthUser(BaseModel):
+    id: int
+    is_admin: bool
+
+    class Config:
+        from_attributes = True
+
+
 class AuthHandler:
+    def __init__(self):
+        # 권한 정보가 없는 (이전에 발급된) 토큰을 위한 사용자 캐시
+        self.user_cache = TTLCache(setting.AUTH_USER_CACHE_SIZE, setting.AUTH_USER_CACHE_TTL)
+
     @staticmethod
-    async def encode_token(user_idx):
+    async def encode_token(user_idx, is_admin):
         payload = {
             'exp': datetime.utcnow() + timedelta(days=10),
             'iat': datetime.utcnow(),
-            'sub': user_idx
+            'sub': user_idx,
+            'is_admin': is_admin
         }
         token = jwt.encode(payload, setting.JWT_SECRET, algorithm=setting.JWT_ALGORITHM)
         return token
@@ -25,22 +41,41 @@ class AuthHandler:
     async def decode_token(self, token):
         try:
             payload = jwt.decode(token, setting.JWT_SECRET, algorithms=setting.JWT_ALGORITHM)
-            return await self.get_user(payload['sub'])
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail='시간이 만료되었습니다. 재로그인 해주세요!')
         except jwt.InvalidTokenError:
             raise HTTPException(status_code=401, detail='비정상적인 접근입니다. 재로그인 해주세요!')
 
+        # 서명이 검증된 토큰의 claim 에 권한 정보가 있으면 DB 조회 없이 사용
+        if 'is_admin' in payload:
+            return AuthUser(id=payload['sub'], is_admin=payload['is_admin'])
+
+        user = await self.get_user(payload['sub'])
+        if user is None:
+            raise HTTPException(status_code=401, detail='비정상적인 접근입니다. 재로그인 해주세요!')
+        return user
+
     async def auth_wrapper(self, auth: HTTPAuthorizationCredentials = Security(security)):
         return await self.decode_token(auth.credentials)
 
 
     async def get_user(self, user_idx):
+        user = self.user_cache.get(user_idx)
+        if user is not None:
+            return user
+
         async with database.session_factory() as db:
-            user = await db.execute(
+            result = await db.execute(
                 select(User)
                 .where(User.id == user_idx)
             )
-            return user.scalar()
+            user = result.scalar()
+
+        if user is None:
+            return None
+
+        user = AuthUser.model_validate(user)
+        self.user_cache.set(user_idx, user)
+        return user
 
 auth = AuthHandler()
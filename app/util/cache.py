@@ -0,0 +1,126 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    '''
+    @ 크기 제한이 있는 in-process LRU 캐시
+    - 최대 개수를 초과하면 가장 오래 사용되지 않은 항목부터 제거
+    - max_size 가 0 이하인 경우 캐시를 사용하지 않음
+
+    :param max_size: 최대 저장 개수
+    '''
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+
+    def get(self, key: Hashable):
+        if key not in self._items:
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return self._items[key]
+
+    def set(self, key: Hashable, value):
+        if self.max_size <= 0:
+            return
+
+        self._items[key] = value
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None):
+        '''
+        @ 캐시 항목 제거
+
+        :param predicate: 제거할 key 조건 (None 인 경우 전체 제거)
+        '''
+        if predicate is None:
+            self._items.clear()
+            return
+
+        for key in [key for key in self._items if predicate(key)]:
+            del self._items[key]
+
+    def stats(self):
+        return {
+            'size': len(self._items),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class TTLCache(LRUCache):
+    '''
+    @ 항목 별 유효 시간(ttl)이 있는 LRU 캐시
+    - 유효 시간이 지난 항목은 조회 시 miss 로 처리하고 제거
+
+    :param max_size: 최대 저장 개수
+    :param ttl: 유효 시간 (초)
+    '''
+
+    def __init__(self, max_size: int, ttl: float):
+        super().__init__(max_size)
+        self.ttl = ttl
+
+    def get(self, key: Hashable):
+        item = super().get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            # 만료된 항목은 hit 이 아닌 miss 로 기록
+            self.hits -= 1
+            self.misses += 1
+            del self._items[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value):
+        super().set(key, (time.monotonic() + self.ttl, value))
+
+
+class SingleFlight:
+    '''
+    @ 같은 key 로 동시에 들어온 로드를 한 번만 실행하고 결과를 함께 사용 (캐시 miss 가 동시에 몰리는 경우 DB 조회를 한 번으로 제한)
+    - 로드는 요청과 분리된 task 로 실행하므로 먼저 들어온 요청이 취소되어도 기다리는 다른 요청에는 영향이 없음
+    - 로드가 끝나면 key 를 제거하므로 결과는 보관하지 않음 (캐시와 함께 사용)
+    '''
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable]):
+        '''
+        :param key: 로드 key
+        :param load: 실행 중인 로드가 없는 경우 실행할 함수 (요청 세션을 사용하지 않아야 함)
+        '''
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(load())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+        # 기다리던 요청이 모두 취소된 경우에도 예외가 기록되지 않은 채 남지 않도록 확인
+        if not future.cancelled():
+            future.exception()
@@ -1,10 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 
+from app.config.database import database
+from app.config.invalidation import invalidation_bus
+from app.config.setting import setting
+from app.quiz.pre_save_buffer import pre_save_buffer
+from app.quiz.repository import group_commit_writer
+from app.quiz.version_worker import quiz_version_worker
 from app.user.endpoint import router as user_router
 from app.quiz.endpoint import router as quiz_router
 
-app = FastAPI(docs_url="/docs", openapi_url="/open-api-docs")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 트래픽을 받기 전에 커넥션 풀을 미리 채워둠
+    await database.warmup(setting.DB_WARMUP_CONNECTIONS)
+    # 다른 워커에서 발생한 변경에 따라 캐시 제거
+    invalidation_bus.start()
+    pre_save_buffer.start()
+    quiz_version_worker.start()
+    yield
+    await quiz_version_worker.stop()
+    # 종료 전 버퍼에 남아 있는 임시 저장 답안 + 모아 둔 최종 제출 저장
+    await pre_save_buffer.stop()
+    await group_commit_writer.stop()
+    await invalidation_bus.stop()
+    await database.close()
+
+
+app = FastAPI(docs_url="/docs", openapi_url="/open-api-docs", lifespan=lifespan)
 
 @app.get('/', tags=['☑️ Healthy Check'])
 def heath_check():
@@ -25,6 +51,7 @@ app.openapi_schema = get_openapi(
         "<h3> ✔️ [GET] /quizzes  : 퀴즈 목록 조회 <h3> \n"
         "<h3> ✔️ [GET] /quiz/{quiz_id}  : 퀴즈 상세 조회 <h3> \n"
         "<h3> ✔️ [POST] /quiz/{quiz_id}/pre-save  : 퀴즈 답안 임시 저장 (새로 고침할 경우 프론트에서 이를 호출하게끔 설계) <h3> \n"
+        "<h3> ✔️ [PATCH] /quiz/{quiz_id}/pre-save  : 퀴즈 답안 임시 저장 (변경된 문제의 답안만 병합) <h3> \n"
         "<h3> ✔️ [POST] /quiz/{quiz_id}/submit  : 퀴즈 답안 최종 제출 <h3> \n"
 
         '''
@@ -0,0 +1,126 @@
+'''
+@ 자주 실행되는 조회 쿼리의 실행 계획이 의도한 인덱스를 사용하는지 확인
+- 운영 데이터가 있는 DB 에서 실행 : python -m migration.check_plans
+- 데이터가 적어 seq scan 이 더 싼 DB 에서는 --force-index 로 seq scan 을 끄고 인덱스를 사용할 수 있는지만 확인
+- 하나라도 인덱스를 사용하지 않으면 exit code 1
+'''
+import asyncio
+import json
+import sys
+
+from sqlalchemy import text
+
+from app.config.database import database
+
+# (이름, 샘플 파라미터 조회 SQL, 확인할 SQL, 사용해야 하는 인덱스)
+CHECKS = [
+    (
+        'sign-in / sign-up : 아이디로 사용자 조회',
+        'SELECT user_id FROM pro."user" LIMIT 1',
+        'SELECT id, is_admin FROM pro."user" WHERE user_id = :user_id',
+        'user_user_id_key'
+    ),
+    (
+        'quiz detail : 최종 제출 답안 조회',
+        'SELECT user_id, quiz_id FROM pro.user_quiz_status WHERE status = 1 LIMIT 1',
+        '''
+        SELECT question_log.question_id, question_log.user_answer
+        FROM pro.question_log
+        JOIN pro.question ON question.id = question_log.question_id
+        WHERE question_log.user_id = :user_id AND question.quiz_id = :quiz_id
+        ''',
+        'question_log_user_id_question_id_idx'
+    ),
+    (
+        'quiz detail : 지급 받은 버전 + 임시 저장 답안 조회',
+        'SELECT user_id, quiz_id FROM pro.pre_save LIMIT 1',
+        '''
+        SELECT quiz_version.version, pre_save.answer
+        FROM pro.pre_save
+        JOIN pro.quiz_version ON quiz_version.id = pre_save.quiz_version_id
+        WHERE pre_save.quiz_id = :quiz_id AND pre_save.user_id = :user_id
+        ''',
+        'pre_save_quiz_id_user_id_key'
+    ),
+    (
+        'quiz detail : 버전 별 문제 구성 조회',
+        'SELECT quiz_id, version FROM pro.quiz_version LIMIT 1',
+        '''
+        SELECT question_ids, selection_ids, selection_counts
+        FROM pro.quiz_version
+        WHERE quiz_id = :quiz_id AND version = :version
+        ''',
+        'quiz_version_quiz_id_version_key'
+    ),
+    (
+        'quiz detail (관리자) : 페이지 단위 문제 조회',
+        'SELECT id AS quiz_id, p_count AS limit, 0 AS offset FROM pro.quiz LIMIT 1',
+        '''
+        SELECT question.id, question.name, selection.id, selection.name, selection.is_correct
+        FROM (
+            SELECT id, name, sequence
+            FROM pro.question
+            WHERE quiz_id = :quiz_id
+            ORDER BY sequence
+            LIMIT :limit OFFSET :offset
+        ) AS question
+        JOIN pro.selection ON selection.question_id = question.id
+        ORDER BY question.sequence, selection.sequence
+        ''',
+        'question_quiz_id_sequence_idx'
+    ),
+    (
+        'submit : 정답표 조회',
+        'SELECT id AS quiz_id FROM pro.quiz LIMIT 1',
+        '''
+        SELECT quiz.s_count, selection.question_id, selection.id
+        FROM pro.quiz
+        LEFT JOIN pro.question ON question.quiz_id = quiz.id
+        LEFT JOIN pro.selection ON selection.question_id = question.id AND selection.is_correct = true
+        WHERE quiz.id = :quiz_id
+        ''',
+        'selection_question_id_is_correct_idx'
+    ),
+]
+
+
+def get_index_names(plan: dict):
+    # 실행 계획 트리에서 사용한 인덱스 이름을 모두 수집
+    names = {plan['Index Name']} if 'Index Name' in plan else set()
+    for child in plan.get('Plans', []):
+        names |= get_index_names(child)
+    return names
+
+
+async def check_plans(force_index: bool):
+    failed = 0
+
+    async with database.async_engine.connect() as connection:
+        for name, sample_sql, sql, index_name in CHECKS:
+            sample = (await connection.execute(text(sample_sql))).mappings().first()
+            if sample is None:
+                print(f'[SKIP] {name} : 샘플 데이터 없음')
+                continue
+
+            if force_index:
+                await connection.execute(text('SET LOCAL enable_seqscan = off'))
+
+            result = await connection.execute(text(f'EXPLAIN (FORMAT JSON) {sql}'), dict(sample))
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            index_names = get_index_names(plan[0]['Plan'])
+
+            if index_name in index_names:
+                print(f'[OK]   {name} : {index_name}')
+            else:
+                failed += 1
+                print(f'[FAIL] {name} : {index_name} 미사용 (사용한 인덱스 : {sorted(index_names) or "없음"})')
+
+            await connection.rollback()
+
+    await database.close()
+    return failed
+
+
+if __name__ == '__main__':
+    sys.exit(1 if asyncio.run(check_plans('--force-index' in sys.argv)) else 0)
@@ -0,0 +1,103 @@
+"""baseline schema
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+기존 운영 DB 는 이 리비전을 stamp 한 뒤 (alembic stamp 0000) upgrade 합니다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0000'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE SCHEMA IF NOT EXISTS pro')
+
+    op.create_table(
+        'user',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('user_id', sa.TEXT(), nullable=False),
+        sa.Column('is_admin', sa.BOOLEAN(), nullable=False),
+        schema='pro'
+    )
+
+    op.create_table(
+        'quiz',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('q_count', sa.Integer(), nullable=False),
+        sa.Column('s_count', sa.Integer(), nullable=False),
+        sa.Column('p_count', sa.Integer(), nullable=False),
+        sa.Column('is_random', sa.BOOLEAN(), nullable=False),
+        schema='pro'
+    )
+
+    op.create_table(
+        'question',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('quiz_id', sa.BigInteger(), sa.ForeignKey('pro.quiz.id'), nullable=False),
+        sa.Column('name', sa.TEXT(), nullable=False),
+        sa.Column('sequence', sa.Integer(), nullable=False),
+        schema='pro'
+    )
+    op.create_index('ix_pro_question_quiz_id', 'question', ['quiz_id'], schema='pro')
+
+    op.create_table(
+        'selection',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('question_id', sa.BigInteger(), sa.ForeignKey('pro.question.id'), nullable=False),
+        sa.Column('name', sa.TEXT(), nullable=False),
+        sa.Column('sequence', sa.Integer(), nullable=False),
+        sa.Column('is_correct', sa.BOOLEAN(), nullable=False),
+        schema='pro'
+    )
+    op.create_index('ix_pro_selection_question_id', 'selection', ['question_id'], schema='pro')
+
+    op.create_table(
+        'question_log',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('user_id', sa.BigInteger(), sa.ForeignKey('pro.user.id'), nullable=False),
+        sa.Column('question_id', sa.BigInteger(), sa.ForeignKey('pro.question.id'), nullable=False),
+        sa.Column('user_answer', sa.TEXT(), nullable=False),
+        sa.Column('is_correct', sa.BOOLEAN(), nullable=False),
+        schema='pro'
+    )
+    op.create_index('ix_pro_question_log_user_id', 'question_log', ['user_id'], schema='pro')
+    op.create_index('ix_pro_question_log_question_id', 'question_log', ['question_id'], schema='pro')
+
+    op.create_table(
+        'quiz_version',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('quiz_id', sa.BigInteger(), sa.ForeignKey('pro.quiz.id'), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('question_ids', sa.TEXT(), nullable=False),
+        sa.Column('selection_info', sa.TEXT(), nullable=False),
+        schema='pro'
+    )
+    op.create_index('ix_pro_quiz_version_quiz_id', 'quiz_version', ['quiz_id'], schema='pro')
+
+    op.create_table(
+        'pre_save',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('quiz_id', sa.BigInteger(), sa.ForeignKey('pro.quiz.id'), nullable=False),
+        sa.Column('quiz_version_id', sa.BigInteger(), sa.ForeignKey('pro.quiz_version.id'), nullable=False),
+        sa.Column('user_id', sa.BigInteger(), sa.ForeignKey('pro.user.id'), nullable=False),
+        sa.Column('answer', sa.TEXT(), nullable=True),
+        schema='pro'
+    )
+    op.create_index('ix_pro_pre_save_quiz_id', 'pre_save', ['quiz_id'], schema='pro')
+    op.create_index('ix_pro_pre_save_quiz_version_id', 'pre_save', ['quiz_version_id'], schema='pro')
+    op.create_index('ix_pro_pre_save_user_id', 'pre_save', ['user_id'], schema='pro')
+
+
+def downgrade() -> None:
+    for table in ('pre_save', 'quiz_version', 'question_log', 'selection', 'question', 'quiz', 'user'):
+        op.drop_table(table, schema='pro')
@@ -0,0 +1,25 @@
+"""add quiz v_count
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0001'
+down_revision: Union[str, None] = '0000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 랜덤 출제 시 생성할 버전 수 (기존 퀴즈는 이전과 동일하게 10개)
+    op.execute('ALTER TABLE pro.quiz ADD COLUMN v_count INTEGER NOT NULL DEFAULT 10')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE pro.quiz DROP COLUMN v_count')
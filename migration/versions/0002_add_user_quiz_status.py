@@ -0,0 +1,50 @@
+"""add user_quiz_status
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 사용자 별 퀴즈 응시 상태 (1 : 최종 제출 / 2 : 진입 혹은 임시 저장)
+    op.execute("""
+        CREATE TABLE pro.user_quiz_status (
+            user_id       BIGINT   NOT NULL REFERENCES pro."user" (id),
+            quiz_id       BIGINT   NOT NULL REFERENCES pro.quiz (id),
+            status        SMALLINT NOT NULL,
+            correct_count INTEGER  NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, quiz_id)
+        )
+    """)
+
+    # 기존 최종 제출 이력 반영
+    op.execute("""
+        INSERT INTO pro.user_quiz_status (user_id, quiz_id, status, correct_count)
+        SELECT question_log.user_id, question.quiz_id, 1, count(*) FILTER (WHERE question_log.is_correct)
+        FROM pro.question_log
+        JOIN pro.question ON question.id = question_log.question_id
+        GROUP BY question_log.user_id, question.quiz_id
+    """)
+
+    # 기존 진입 / 임시 저장 이력 반영
+    op.execute("""
+        INSERT INTO pro.user_quiz_status (user_id, quiz_id, status, correct_count)
+        SELECT DISTINCT user_id, quiz_id, 2, 0
+        FROM pro.pre_save
+        ON CONFLICT (user_id, quiz_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TABLE pro.user_quiz_status')
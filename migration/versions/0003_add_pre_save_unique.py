@@ -0,0 +1,37 @@
+"""add pre_save unique
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 동시 진입으로 생긴 중복 임시 저장 데이터 정리 (사용자 + 퀴즈 별로 가장 최근 데이터만 유지)
+    op.execute("""
+        DELETE FROM pro.pre_save
+        USING pro.pre_save AS newer
+        WHERE pre_save.quiz_id = newer.quiz_id
+          AND pre_save.user_id = newer.user_id
+          AND pre_save.id < newer.id
+    """)
+
+    # 사용자는 퀴즈 별로 하나의 버전만 지급 받음
+    op.execute("""
+        ALTER TABLE pro.pre_save
+            ADD CONSTRAINT pre_save_quiz_id_user_id_key UNIQUE (quiz_id, user_id)
+    """)
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE pro.pre_save DROP CONSTRAINT pre_save_quiz_id_user_id_key')
@@ -0,0 +1,96 @@
+"""quiz version arrays
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 퀴즈 버전의 문제 / 보기 순서를 json 문자열에서 배열로 변경
+    # question_ids : 문제 순서 / selection_ids : 문제 순서대로 이어 붙인 보기 순서 / selection_counts : 문제 별 보기 수
+    op.execute("""
+        ALTER TABLE pro.quiz_version
+            ADD COLUMN question_id_array BIGINT[],
+            ADD COLUMN selection_ids     BIGINT[],
+            ADD COLUMN selection_counts  INTEGER[]
+    """)
+
+    op.execute("""
+        UPDATE pro.quiz_version
+        SET question_id_array = ARRAY(
+                SELECT q.question_id::BIGINT
+                FROM jsonb_array_elements_text(question_ids::JSONB) WITH ORDINALITY AS q(question_id, position)
+                ORDER BY q.position
+            ),
+            selection_ids = ARRAY(
+                SELECT s.selection_id::BIGINT
+                FROM jsonb_array_elements_text(question_ids::JSONB) WITH ORDINALITY AS q(question_id, position)
+                CROSS JOIN LATERAL jsonb_array_elements_text(selection_info::JSONB -> q.question_id)
+                    WITH ORDINALITY AS s(selection_id, position)
+                ORDER BY q.position, s.position
+            ),
+            selection_counts = ARRAY(
+                SELECT jsonb_array_length(selection_info::JSONB -> q.question_id)
+                FROM jsonb_array_elements_text(question_ids::JSONB) WITH ORDINALITY AS q(question_id, position)
+                ORDER BY q.position
+            )
+    """)
+
+    op.execute("""
+        ALTER TABLE pro.quiz_version
+            DROP COLUMN question_ids,
+            DROP COLUMN selection_info
+    """)
+
+    op.execute('ALTER TABLE pro.quiz_version RENAME COLUMN question_id_array TO question_ids')
+
+    op.execute("""
+        ALTER TABLE pro.quiz_version
+            ALTER COLUMN question_ids SET NOT NULL,
+            ALTER COLUMN selection_ids SET NOT NULL,
+            ALTER COLUMN selection_counts SET NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE pro.quiz_version
+            ADD COLUMN question_id_json TEXT,
+            ADD COLUMN selection_info   TEXT
+    """)
+    op.execute("""
+        UPDATE pro.quiz_version
+        SET question_id_json = to_jsonb(question_ids)::TEXT,
+            selection_info = (
+                SELECT jsonb_object_agg(q.question_id, to_jsonb(selection_ids[q.start:q.start + q.selection_count - 1]))::TEXT
+                FROM (
+                    SELECT question_id,
+                           selection_count,
+                           1 + coalesce(sum(selection_count) OVER (ORDER BY position ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), 0) AS start
+                    FROM unnest(question_ids, selection_counts) WITH ORDINALITY AS u(question_id, selection_count, position)
+                ) AS q
+            )
+    """)
+    op.execute("""
+        ALTER TABLE pro.quiz_version
+            DROP COLUMN question_ids,
+            DROP COLUMN selection_ids,
+            DROP COLUMN selection_counts
+    """)
+    op.execute('ALTER TABLE pro.quiz_version RENAME COLUMN question_id_json TO question_ids')
+    op.execute("""
+        ALTER TABLE pro.quiz_version
+            ALTER COLUMN question_ids SET NOT NULL,
+            ALTER COLUMN selection_info SET NOT NULL
+    """)
@@ -0,0 +1,39 @@
+"""compact answers
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 최종 제출 답안을 json 문자열 ("[1, 2]") 에서 정렬된 보기 PK 배열로 변경
+    op.execute("""
+        ALTER TABLE pro.question_log
+            ALTER COLUMN user_answer TYPE BIGINT[] USING translate(user_answer, '[]', '{}')::BIGINT[]
+    """)
+
+    # 임시 저장 답안을 json 문자열에서 jsonb 로 변경 (진입만 한 경우 NULL)
+    op.execute("""
+        ALTER TABLE pro.pre_save
+            ALTER COLUMN answer DROP NOT NULL,
+            ALTER COLUMN answer TYPE JSONB USING answer::JSONB
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE pro.question_log
+            ALTER COLUMN user_answer TYPE TEXT USING to_jsonb(user_answer)::TEXT
+    """)
+    op.execute('ALTER TABLE pro.pre_save ALTER COLUMN answer TYPE TEXT USING answer::TEXT')
@@ -0,0 +1,158 @@
+"""add access path indexes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:00:00
+
+조회 조건에 맞춘 복합 / unique 인덱스 추가 (실행 계획 확인 : python -m migration.check_plans)
+- user (user_id) : 로그인 / 회원 가입
+- question_log (user_id, question_id) : 사용자 별 최종 제출 답안 조회
+- selection (question_id, is_correct) : 문제 별 보기 / 정답 보기 조회
+- quiz_version (quiz_id, version) : 퀴즈 진입 / 버전 별 문제 구성 조회
+- pre_save (quiz_id, user_id) 는 0003 의 unique 제약 사용
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAMES = [
+    'user_user_id_key',
+    'question_log_user_id_question_id_idx',
+    'selection_question_id_is_correct_idx',
+    'quiz_version_quiz_id_version_key'
+]
+
+
+def merge_duplicate_users() -> None:
+    # 중복 체크 후 저장하던 회원 가입으로 생긴 같은 아이디의 사용자를 가장 먼저 가입한 사용자로 합침
+    # 같은 퀴즈의 데이터가 양쪽에 있으면 먼저 가입한 사용자의 데이터 (임시 저장 / 최종 제출 답안 각각) 를 유지
+    op.execute("""
+        CREATE TEMPORARY TABLE duplicate_user ON COMMIT DROP AS
+        SELECT id AS duplicate_id, keeper_id
+        FROM (SELECT id, min(id) OVER (PARTITION BY user_id) AS keeper_id FROM pro."user") AS users
+        WHERE id != keeper_id
+    """)
+
+    op.execute("""
+        DELETE FROM pro.pre_save
+        USING duplicate_user, pro.pre_save AS kept
+        WHERE pre_save.user_id = duplicate_user.duplicate_id
+          AND kept.user_id = duplicate_user.keeper_id AND kept.quiz_id = pre_save.quiz_id
+    """)
+    op.execute("""
+        UPDATE pro.pre_save SET user_id = duplicate_user.keeper_id
+        FROM duplicate_user WHERE pre_save.user_id = duplicate_user.duplicate_id
+    """)
+
+    op.execute("""
+        DELETE FROM pro.question_log
+        USING duplicate_user, pro.question, pro.question_log AS kept, pro.question AS kept_question
+        WHERE question_log.user_id = duplicate_user.duplicate_id
+          AND question.id = question_log.question_id
+          AND kept.user_id = duplicate_user.keeper_id
+          AND kept_question.id = kept.question_id AND kept_question.quiz_id = question.quiz_id
+    """)
+    op.execute("""
+        UPDATE pro.question_log SET user_id = duplicate_user.keeper_id
+        FROM duplicate_user WHERE question_log.user_id = duplicate_user.duplicate_id
+    """)
+
+    # 합친 사용자의 응시 상태는 옮겨진 question_log / pre_save 기준으로 다시 계산 (0002 와 같은 방식)
+    # -> 한쪽의 최종 제출 이력이 옮겨졌는데 진입 상태 (2) 가 남는 등 상태와 답안이 어긋나지 않도록 함
+    op.execute("""
+        DELETE FROM pro.user_quiz_status
+        USING duplicate_user
+        WHERE user_quiz_status.user_id IN (duplicate_user.duplicate_id, duplicate_user.keeper_id)
+    """)
+    op.execute("""
+        INSERT INTO pro.user_quiz_status (user_id, quiz_id, status, correct_count)
+        SELECT question_log.user_id, question.quiz_id, 1, count(*) FILTER (WHERE question_log.is_correct)
+        FROM pro.question_log
+        JOIN pro.question ON question.id = question_log.question_id
+        WHERE question_log.user_id IN (SELECT keeper_id FROM duplicate_user)
+        GROUP BY question_log.user_id, question.quiz_id
+    """)
+    op.execute("""
+        INSERT INTO pro.user_quiz_status (user_id, quiz_id, status, correct_count)
+        SELECT DISTINCT user_id, quiz_id, 2, 0
+        FROM pro.pre_save
+        WHERE user_id IN (SELECT keeper_id FROM duplicate_user)
+        ON CONFLICT (user_id, quiz_id) DO NOTHING
+    """)
+
+    op.execute('DELETE FROM pro."user" USING duplicate_user WHERE "user".id = duplicate_user.duplicate_id')
+
+
+def drop_invalid_indexes() -> None:
+    # 이전 실행에서 CONCURRENTLY 생성이 실패하면 INVALID 인덱스가 남아 IF NOT EXISTS 로 건너뛰게 되므로 먼저 제거
+    # (SQL 만 출력하는 offline 모드에서는 DB 를 조회할 수 없으므로 건너뜀)
+    if op.get_context().as_sql:
+        return
+
+    invalid_index_names = op.get_bind().execute(
+        text("""
+            SELECT index_class.relname
+            FROM pg_index
+            JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid
+            JOIN pg_namespace ON pg_namespace.oid = index_class.relnamespace
+            WHERE pg_namespace.nspname = 'pro'
+              AND NOT pg_index.indisvalid
+              AND index_class.relname = ANY(:index_names)
+        """),
+        {'index_names': INDEX_NAMES}
+    ).scalars().all()
+
+    for index_name in invalid_index_names:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS pro.{index_name}')
+
+
+def upgrade() -> None:
+    merge_duplicate_users()
+
+    # 운영 중인 테이블을 잠그지 않도록 CONCURRENTLY 로 생성 (트랜잭션 밖에서 실행)
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes()
+        op.execute('CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS user_user_id_key ON pro."user" (user_id)')
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS question_log_user_id_question_id_idx
+            ON pro.question_log (user_id, question_id)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS selection_question_id_is_correct_idx
+            ON pro.selection (question_id, is_correct)
+        """)
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS quiz_version_quiz_id_version_key
+            ON pro.quiz_version (quiz_id, version)
+        """)
+
+    op.execute('ALTER TABLE pro."user" ADD CONSTRAINT user_user_id_key UNIQUE USING INDEX user_user_id_key')
+    op.execute("""
+        ALTER TABLE pro.quiz_version
+            ADD CONSTRAINT quiz_version_quiz_id_version_key UNIQUE USING INDEX quiz_version_quiz_id_version_key
+    """)
+
+    # 새 복합 인덱스의 첫 번째 컬럼과 같은 단일 컬럼 인덱스는 제거
+    op.execute('DROP INDEX IF EXISTS pro.ix_pro_question_log_user_id')
+    op.execute('DROP INDEX IF EXISTS pro.ix_pro_selection_question_id')
+    op.execute('DROP INDEX IF EXISTS pro.ix_pro_quiz_version_quiz_id')
+    op.execute('DROP INDEX IF EXISTS pro.ix_pro_pre_save_quiz_id')
+
+
+def downgrade() -> None:
+    op.execute('CREATE INDEX IF NOT EXISTS ix_pro_pre_save_quiz_id ON pro.pre_save (quiz_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_pro_quiz_version_quiz_id ON pro.quiz_version (quiz_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_pro_selection_question_id ON pro.selection (question_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_pro_question_log_user_id ON pro.question_log (user_id)')
+
+    op.execute('ALTER TABLE pro.quiz_version DROP CONSTRAINT quiz_version_quiz_id_version_key')
+    op.execute('ALTER TABLE pro."user" DROP CONSTRAINT user_user_id_key')
+    op.execute('DROP INDEX pro.selection_question_id_is_correct_idx')
+    op.execute('DROP INDEX pro.question_log_user_id_question_id_idx')
@@ -0,0 +1,33 @@
+"""add question sequence index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:00
+
+관리자 상세 조회에서 퀴즈 별 문제를 sequence 순서로 페이지 단위 조회 (quiz_id, sequence)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS question_quiz_id_sequence_idx
+            ON pro.question (quiz_id, sequence)
+        """)
+
+    # 새 복합 인덱스의 첫 번째 컬럼과 같은 단일 컬럼 인덱스는 제거
+    op.execute('DROP INDEX IF EXISTS pro.ix_pro_question_quiz_id')
+
+
+def downgrade() -> None:
+    op.execute('CREATE INDEX IF NOT EXISTS ix_pro_question_quiz_id ON pro.question (quiz_id)')
+    op.execute('DROP INDEX pro.question_quiz_id_sequence_idx')
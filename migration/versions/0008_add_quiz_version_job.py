@@ -0,0 +1,47 @@
+"""add quiz_version_job + quiz.is_ready
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 퀴즈 버전 생성 완료 여부 (기존 퀴즈는 버전이 있는 경우만 준비 완료, 새 퀴즈는 준비 중으로 생성)
+    op.execute('ALTER TABLE pro.quiz ADD COLUMN is_ready BOOLEAN NOT NULL DEFAULT false')
+    op.execute("""
+        UPDATE pro.quiz SET is_ready = true
+        WHERE EXISTS (SELECT 1 FROM pro.quiz_version WHERE quiz_version.quiz_id = quiz.id)
+    """)
+
+    # 퀴즈 버전 생성 작업 큐 (0 : 대기 / 1 : 실패 - 최대 시도 횟수 초과)
+    op.execute("""
+        CREATE TABLE pro.quiz_version_job (
+            id         BIGSERIAL PRIMARY KEY,
+            quiz_id    BIGINT    NOT NULL UNIQUE REFERENCES pro.quiz (id),
+            status     SMALLINT  NOT NULL DEFAULT 0,
+            attempts   INTEGER   NOT NULL DEFAULT 0,
+            last_error TEXT
+        )
+    """)
+
+    # 버전이 생성되지 않은 기존 퀴즈는 작업 등록
+    op.execute("""
+        INSERT INTO pro.quiz_version_job (quiz_id)
+        SELECT id FROM pro.quiz WHERE NOT is_ready
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TABLE pro.quiz_version_job')
+    op.execute('ALTER TABLE pro.quiz DROP COLUMN is_ready')
@@ -0,0 +1,25 @@
+"""add pre_save.updated_at
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 임시 저장 답안을 받은 시각 (이전에 받은 답안이 늦게 저장되어 최신 답안을 덮어쓰지 않도록 비교)
+    op.execute('ALTER TABLE pro.pre_save ADD COLUMN updated_at TIMESTAMPTZ')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE pro.pre_save DROP COLUMN updated_at')
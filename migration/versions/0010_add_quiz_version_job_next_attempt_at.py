@@ -0,0 +1,25 @@
+"""add quiz_version_job.next_attempt_at
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 다음 시도 가능 시각 (실패한 작업은 재시도 대기 시간이 지난 뒤에 다시 가져감)
+    op.execute('ALTER TABLE pro.quiz_version_job ADD COLUMN next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT now()')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE pro.quiz_version_job DROP COLUMN next_attempt_at')
@@ -0,0 +1,29 @@
+"""replace pre_save.updated_at with revision
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 답안을 받은 순서는 서버 시각 대신 DB sequence 로 비교 (워커 간 시각 차이에 영향을 받지 않음)
+    op.execute('CREATE SEQUENCE pro.pre_save_revision_seq')
+    op.execute('ALTER TABLE pro.pre_save ADD COLUMN revision BIGINT')
+    op.execute('ALTER TABLE pro.pre_save DROP COLUMN updated_at')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE pro.pre_save ADD COLUMN updated_at TIMESTAMPTZ')
+    op.execute('ALTER TABLE pro.pre_save DROP COLUMN revision')
+    op.execute('DROP SEQUENCE pro.pre_save_revision_seq')
@@ -0,0 +1,32 @@
+import os
+
+# app 모듈은 import 시 설정으로 engine 을 만들므로 (연결은 하지 않음) DB 없이도 import 되도록 기본값 지정
+for key, value in {
+    'DB_USER': 'test',
+    'DB_PW': 'test',
+    'DB_HOST': 'localhost',
+    'DB_PORT': '5432',
+    'DB_NAME': 'test',
+    'JWT_SECRET': 'test',
+    'JWT_ALGORITHM': 'HS256'
+}.items():
+    os.environ.setdefault(key, value)
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.config.database import database
+
+
+@asynccontextmanager
+async def fake_session():
+    yield None
+
+
+@pytest.fixture
+def fake_session_factory(monkeypatch):
+    '''
+    @ 백그라운드 저장이 새로 여는 세션을 DB 연결 없는 가짜 세션으로 교체
+    '''
+    monkeypatch.setattr(database, 'session_factory', fake_session)
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from app.config.database import database
+
+
+def test_gather_returns_results_in_call_order(fake_session_factory):
+    async def slow(db):
+        await asyncio.sleep(0.01)
+        return 'slow'
+
+    async def fast(db):
+        return 'fast'
+
+    assert asyncio.run(database.gather(None, slow, fast, fast)) == ['slow', 'fast', 'fast']
+
+
+def test_failure_cancels_and_awaits_other_calls(fake_session_factory):
+    finished = []
+
+    async def fail(db):
+        raise ValueError('query failed')
+
+    async def slow(db):
+        try:
+            await asyncio.sleep(60)
+        finally:
+            finished.append('slow')
+
+    async def run():
+        with pytest.raises(ValueError):
+            await database.gather(None, fail, slow)
+        # 예외가 전달되는 시점에는 다른 조회가 이미 정리된 상태
+        return list(finished)
+
+    assert asyncio.run(run()) == ['slow']
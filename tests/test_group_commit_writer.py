@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from app.quiz import repository
+from app.quiz.repository import GroupCommitWriter
+
+
+@pytest.fixture
+def saved(monkeypatch, fake_session_factory):
+    '''
+    @ save_final_submissions 대신 호출된 배치를 기록 (already_submitted 에 있는 제출은 저장되지 않은 것으로 처리)
+    '''
+    calls = {'batches': [], 'already_submitted': set(), 'error': None}
+
+    async def save_final_submissions(db, submissions):
+        calls['batches'].append(list(submissions))
+        await asyncio.sleep(0)
+        if calls['error'] is not None:
+            raise calls['error']
+        return {
+            (user_idx, quiz_id) for user_idx, quiz_id, _ in submissions
+            if (user_idx, quiz_id) not in calls['already_submitted']
+        }
+
+    monkeypatch.setattr(repository, 'save_final_submissions', save_final_submissions)
+    return calls
+
+
+def test_batches_are_split_by_max_batch_size(saved):
+    async def run():
+        writer = GroupCommitWriter(window_ms=60_000, max_batch_size=2)
+        results = await asyncio.gather(*(writer.submit(None, 1, user_idx, []) for user_idx in range(5)))
+        await writer.stop()
+        return results
+
+    assert asyncio.run(run()) == [True] * 5
+    assert sorted(len(batch) for batch in saved['batches']) == [1, 2, 2]
+    assert sorted(user_idx for batch in saved['batches'] for user_idx, _, _ in batch) == list(range(5))
+
+
+def test_window_flushes_partial_batch(saved):
+    async def run():
+        writer = GroupCommitWriter(window_ms=10, max_batch_size=100)
+        return await asyncio.gather(writer.submit(None, 1, 1, []), writer.submit(None, 1, 2, []))
+
+    assert asyncio.run(run()) == [True, True]
+    assert len(saved['batches']) == 1
+
+
+def test_each_future_gets_its_own_result(saved):
+    saved['already_submitted'].add((2, 1))
+
+    async def run():
+        writer = GroupCommitWriter(window_ms=10, max_batch_size=100)
+        return await asyncio.gather(
+            writer.submit(None, 1, 1, ['first']),
+            writer.submit(None, 1, 2, []),
+            # 같은 배치의 중복 제출은 먼저 들어온 제출만 저장
+            writer.submit(None, 1, 1, ['second'])
+        )
+
+    assert asyncio.run(run()) == [True, False, False]
+    assert saved['batches'] == [[(1, 1, ['first']), (2, 1, [])]]
+
+
+def test_write_failure_is_raised_to_every_submitter(saved):
+    saved['error'] = RuntimeError('db down')
+
+    async def run():
+        writer = GroupCommitWriter(window_ms=10, max_batch_size=100)
+        return await asyncio.gather(
+            writer.submit(None, 1, 1, []), writer.submit(None, 1, 2, []), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_disabled_writer_writes_with_request_session(monkeypatch):
+    calls = []
+
+    async def final_submit_user_answer(db, quiz_id, user_idx, question_logs):
+        calls.append((db, quiz_id, user_idx))
+        return True
+
+    monkeypatch.setattr(repository, 'final_submit_user_answer', final_submit_user_answer)
+    writer = GroupCommitWriter(window_ms=0, max_batch_size=100)
+
+    assert asyncio.run(writer.submit('request-session', 1, 2, [])) is True
+    assert calls == [('request-session', 1, 2)]
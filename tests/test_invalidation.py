@@ -0,0 +1,53 @@
+import asyncio
+
+from app.config.database import is_read_only
+from app.config.invalidation import InvalidationBus, InvalidationEvent, InvalidationType
+
+
+class CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+def test_publish_is_routed_to_primary():
+    bus = InvalidationBus('test', 1, 1)
+    db = CapturingSession()
+
+    asyncio.run(bus.publish(db, [InvalidationEvent(type=InvalidationType.QUIZ_CREATED, quiz_id=1)]))
+
+    assert len(db.statements) == 1
+    assert not is_read_only(db.statements[0])
+
+
+def test_publish_without_events_runs_no_query():
+    db = CapturingSession()
+    asyncio.run(InvalidationBus('test', 1, 1).publish(db, []))
+    assert db.statements == []
+
+
+def test_notification_is_dispatched_to_handlers_of_its_type():
+    bus = InvalidationBus('test', 1, 1)
+    received = []
+    bus.subscribe(InvalidationType.QUIZ_VERSIONS_READY, received.append)
+    bus.subscribe(InvalidationType.QUIZ_CREATED, lambda event: received.append('created'))
+
+    payload = InvalidationEvent(type=InvalidationType.QUIZ_VERSIONS_READY, quiz_id=3).model_dump_json()
+    bus._on_notify(None, 0, 'test', payload)
+    bus._on_notify(None, 0, 'test', 'not json')
+
+    assert received == [InvalidationEvent(type=InvalidationType.QUIZ_VERSIONS_READY, quiz_id=3)]
+
+
+def test_reset_sends_event_without_ids_to_every_type():
+    bus = InvalidationBus('test', 1, 1)
+    received = []
+    bus.subscribe(InvalidationType.QUIZ_CREATED, received.append)
+    bus.subscribe(InvalidationType.QUIZ_SUBMITTED, received.append)
+
+    bus._reset()
+
+    assert {event.type for event in received} == {InvalidationType.QUIZ_CREATED, InvalidationType.QUIZ_SUBMITTED}
+    assert all(event.quiz_id is None and event.user_id is None for event in received)
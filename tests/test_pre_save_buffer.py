@@ -0,0 +1,213 @@
+import asyncio
+import json
+
+import pytest
+
+from app.quiz import repository
+from app.quiz.pre_save_buffer import PreSaveBuffer
+
+
+@pytest.fixture(autouse=True)
+def revisions(monkeypatch):
+    '''
+    @ next_pre_save_revision 대신 1 부터 증가하는 revision 발급
+    '''
+    issued = []
+
+    async def next_pre_save_revision(db):
+        issued.append(len(issued) + 1)
+        return issued[-1]
+
+    monkeypatch.setattr(repository, 'next_pre_save_revision', next_pre_save_revision)
+    return issued
+
+
+@pytest.fixture
+def writes(monkeypatch, fake_session_factory):
+    '''
+    @ update_pre_save_data 대신 저장 요청을 기록 (on_write 가 있으면 저장 중에 실행)
+    '''
+    calls = {'writes': [], 'on_write': None}
+
+    async def update_pre_save_data(db, pre_save_answers, merge=False):
+        calls['writes'].append((merge, [
+            (user_idx, quiz_id, json.loads(answer), revision) for user_idx, quiz_id, answer, revision in pre_save_answers
+        ]))
+        if calls['on_write'] is not None:
+            await calls['on_write']()
+
+    monkeypatch.setattr(repository, 'update_pre_save_data', update_pre_save_data)
+    return calls
+
+
+def test_apply_without_pending_answer_returns_stored_answer():
+    buffer = PreSaveBuffer(flush_interval=1, batch_size=10)
+    assert buffer.apply(1, 1, {'1': [2]}) == {'1': [2]}
+
+
+def test_put_replaces_and_merge_merges_stored_answer():
+    buffer = PreSaveBuffer(flush_interval=1, batch_size=10)
+
+    async def run():
+        await buffer.merge(None, 1, 1, {'2': [5]})
+        await buffer.put(None, 1, 2, {'3': [6]})
+
+    asyncio.run(run())
+    assert buffer.apply(1, 1, {'1': [4], '2': [4]}) == {'1': [4], '2': [5]}
+    assert buffer.apply(1, 2, {'1': [4]}) == {'3': [6]}
+
+
+def test_merge_after_put_stays_full_answer_with_latest_revision():
+    buffer = PreSaveBuffer(flush_interval=1, batch_size=10)
+
+    async def run():
+        await buffer.put(None, 1, 1, {'1': [4]})
+        await buffer.merge(None, 1, 1, {'2': [5]})
+
+    asyncio.run(run())
+    assert buffer._pending[(1, 1)] == (True, {'1': [4], '2': [5]}, 2)
+
+
+def test_flush_writes_revision_issued_when_answer_was_received(writes):
+    buffer = PreSaveBuffer(flush_interval=1, batch_size=10)
+
+    async def run():
+        await buffer.put(None, 1, 1, {'1': [4]})
+        await buffer.put(None, 2, 1, {'1': [5]})
+        await buffer.put(None, 1, 1, {'1': [6]})
+        await buffer.flush()
+
+    asyncio.run(run())
+    assert writes['writes'] == [(False, [(1, 1, {'1': [6]}, 3), (2, 1, {'1': [5]}, 2)])]
+
+
+def test_disabled_buffer_writes_directly_without_revision(writes, revisions):
+    buffer = PreSaveBuffer(flush_interval=0, batch_size=10)
+
+    async def run():
+        await buffer.put(None, 1, 1, {'1': [4]})
+        await buffer.merge(None, 1, 1, {'2': [5]})
+
+    asyncio.run(run())
+    # revision 은 저장 시 DB 에서 발급
+    assert writes['writes'] == [(False, [(1, 1, {'1': [4]}, None)]), (True, [(1, 1, {'2': [5]}, None)])]
+    assert revisions == []
+
+
+def test_flush_writes_full_and_merge_answers_separately(writes):
+    buffer = PreSaveBuffer(flush_interval=1, batch_size=10)
+
+    async def run():
+        await buffer.put(None, 1, 1, {'1': [4]})
+        await buffer.merge(None, 2, 1, {'2': [5]})
+        await buffer.flush()
+
+    asyncio.run(run())
+    assert [(merge, [(user_idx, answer) for user_idx, _, answer, _ in rows]) for merge, rows in writes['writes']] == [
+        (False, [(1, {'1': [4]})]),
+        (True, [(2, {'2': [5]})])
+    ]
+    assert buffer._pending == {} and buffer._flushing == {}
+
+
+def test_flushing_answer_is_visible_until_written(writes):
+    buffer = PreSaveBuffer(flush_interval=1, batch_size=10)
+    seen = []
+
+    async def on_write():
+        seen.append(buffer.apply(1, 1, None))
+
+    writes['on_write'] = on_write
+
+    async def run():
+        await buffer.put(None, 1, 1, {'1': [4]})
+        await buffer.flush()
+
+    asyncio.run(run())
+    assert seen == [{'1': [4]}]
+    assert buffer.apply(1, 1, None) is None
+
+
+def test_failed_flush_requeues_and_merges_newer_changes(writes):
+    buffer = PreSaveBuffer(flush_interval=1, batch_size=10)
+
+    async def on_write():
+        # 저장 중에 같은 사용자의 변경 답안이 새로 들어온 뒤 저장 실패
+        await buffer.merge(None, 1, 1, {'2': [6]})
+        raise RuntimeError('db down')
+
+    writes['on_write'] = on_write
+
+    async def run():
+        await buffer.put(None, 1, 1, {'1': [4], '2': [5]})
+        await buffer.flush()
+
+    asyncio.run(run())
+    is_full, answer, _ = buffer._pending[(1, 1)]
+    assert is_full and answer == {'1': [4], '2': [6]}
+    assert buffer._flushing == {}
+
+
+def test_failed_flush_is_dropped_when_newer_full_answer_arrived(writes):
+    buffer = PreSaveBuffer(flush_interval=1, batch_size=10)
+
+    async def on_write():
+        await buffer.put(None, 1, 1, {'1': [7]})
+        raise RuntimeError('db down')
+
+    writes['on_write'] = on_write
+
+    async def run():
+        await buffer.put(None, 1, 1, {'1': [4]})
+        await buffer.flush()
+
+    asyncio.run(run())
+    assert buffer._pending[(1, 1)][:2] == (True, {'1': [7]})
+
+
+def test_failed_flush_requeues_remaining_batches(writes):
+    buffer = PreSaveBuffer(flush_interval=1, batch_size=1)
+
+    async def on_write():
+        if len(writes['writes']) == 2:
+            raise RuntimeError('db down')
+
+    writes['on_write'] = on_write
+
+    async def run():
+        for user_idx in (1, 2, 3):
+            await buffer.put(None, user_idx, 1, {'1': [user_idx]})
+        await buffer.flush()
+
+    asyncio.run(run())
+    # 첫 배치는 저장, 실패한 배치부터 다시 보관
+    assert set(buffer._pending) == {(2, 1), (3, 1)}
+
+
+def test_discard_drops_pending_answer():
+    buffer = PreSaveBuffer(flush_interval=1, batch_size=10)
+    asyncio.run(buffer.put(None, 1, 1, {'1': [4]}))
+
+    buffer.discard(1, 1)
+    assert buffer.apply(1, 1, None) is None
+
+
+def test_stop_during_flush_saves_every_answer(writes):
+    buffer = PreSaveBuffer(flush_interval=0.01, batch_size=1)
+
+    async def slow_write():
+        await asyncio.sleep(0.05)
+
+    writes['on_write'] = slow_write
+
+    async def run():
+        for quiz_id in range(5):
+            await buffer.put(None, 1, quiz_id, {'1': [quiz_id]})
+        buffer.start()
+        # 첫 배치를 저장하는 중에 종료
+        await asyncio.sleep(0.03)
+        await buffer.stop()
+
+    asyncio.run(run())
+    assert sorted(quiz_id for _, answers in writes['writes'] for _, quiz_id, _, _ in answers) == list(range(5))
+    assert buffer._pending == {} and buffer._flushing == {}
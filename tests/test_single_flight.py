@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from app.util.cache import SingleFlight
+
+
+def test_concurrent_calls_share_one_load():
+    single_flight = SingleFlight()
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def run():
+        return await asyncio.gather(*(single_flight.do('key', load) for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert len(loads) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.shared == 9
+    assert single_flight._calls == {}
+
+
+def test_different_keys_load_separately():
+    single_flight = SingleFlight()
+
+    async def run():
+        return await asyncio.gather(
+            single_flight.do('a', lambda: asyncio.sleep(0, result='a')),
+            single_flight.do('b', lambda: asyncio.sleep(0, result='b'))
+        )
+
+    assert asyncio.run(run()) == ['a', 'b']
+
+
+def test_error_is_raised_to_every_waiter_and_next_call_reloads():
+    single_flight = SingleFlight()
+    loads = []
+
+    async def failing_load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError('load failed')
+
+    async def run():
+        results = await asyncio.gather(
+            *(single_flight.do('key', failing_load) for _ in range(3)), return_exceptions=True
+        )
+        assert single_flight._calls == {}
+        # 실패한 로드는 보관하지 않으므로 다음 호출은 다시 로드
+        with pytest.raises(ValueError):
+            await single_flight.do('key', failing_load)
+        return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(loads) == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_load():
+    single_flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        return 'done'
+
+    async def run():
+        first = asyncio.ensure_future(single_flight.do('key', load))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(single_flight.do('key', load))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == 'done'